@@ -42,10 +42,12 @@ import math
 import hashlib
 import ast
 import operator
+import functools
+import struct
 from datetime import datetime
 from typing import Dict, Any, Optional, Callable
 from dataclasses import dataclass, field
-from collections import defaultdict
+from collections import defaultdict, deque
 import base64
 
 # =============================================================================
@@ -55,6 +57,7 @@ REQUIRED_PACKAGES = [
     ('psutil', 'psutil'),
     ('cryptography', 'cryptography'),
     ('requests', 'requests'),
+    ('orjson', 'orjson'),
 ]
 
 def genesis_bootstrap():
@@ -89,16 +92,17 @@ genesis_bootstrap()
 
 # Post-genesis imports
 import psutil
-from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
 from cryptography.hazmat.backends import default_backend
 import requests
+import orjson
 
 # =============================================================================
 # PHASE 2: CONFIGURATION
 # =============================================================================
-@dataclass
+@dataclass(slots=True)
 class NodeConfig:
     """Immutable node configuration"""
     node_id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
@@ -121,8 +125,10 @@ class NodeIdentity:
     """
     Manages cryptographic identity for the node.
     Each node has a unique RSA keypair for authentication.
-    Swarm communication uses rotating Fernet keys.
+    Swarm communication uses AES-GCM with a shared swarm key.
     """
+
+    NONCE_SIZE = 12
     
     def __init__(self, data_dir: str):
         self.data_dir = data_dir
@@ -130,6 +136,13 @@ class NodeIdentity:
         self.public_key_path = os.path.join(data_dir, "node.pub")
         self._load_or_generate_keys()
         self._init_swarm_cipher()
+        # Fingerprint never changes for a loaded keypair; computing it per
+        # broadcast would re-serialize the public key and re-hash every packet.
+        pub_bytes = self.public_key.public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        self._fingerprint = hashlib.sha256(pub_bytes).hexdigest()[:16]
     
     def _load_or_generate_keys(self):
         if os.path.exists(self.private_key_path):
@@ -171,26 +184,37 @@ class NodeIdentity:
             with open(key_path, "rb") as f:
                 self.swarm_key = f.read()
         else:
-            self.swarm_key = Fernet.generate_key()
+            self.swarm_key = os.urandom(32)
             with open(key_path, "wb") as f:
                 f.write(self.swarm_key)
             os.chmod(key_path, 0o600)
-        self.cipher = Fernet(self.swarm_key)
+        # AES-256-GCM dispatches straight to OpenSSL (AES-NI accelerated),
+        # avoiding Fernet's HMAC + base64 framing on every packet.
+        self.cipher = AESGCM(self.swarm_key[:32])
     
     def get_fingerprint(self) -> str:
-        """Returns SHA256 fingerprint of public key"""
-        pub_bytes = self.public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
-        return hashlib.sha256(pub_bytes).hexdigest()[:16]
+        """Returns cached SHA256 fingerprint of public key"""
+        return self._fingerprint
     
+    def encrypt_raw(self, plaintext: bytes) -> bytes:
+        nonce = os.urandom(self.NONCE_SIZE)
+        return nonce + self.cipher.encrypt(nonce, plaintext, None)
+
+    def decrypt_raw(self, token: bytes) -> Optional[bytes]:
+        try:
+            return self.cipher.decrypt(token[:self.NONCE_SIZE], token[self.NONCE_SIZE:], None)
+        except Exception:
+            return None
+
     def encrypt(self, data: dict) -> bytes:
-        return self.cipher.encrypt(json.dumps(data).encode())
-    
+        return self.encrypt_raw(orjson.dumps(data))
+
     def decrypt(self, token: bytes) -> Optional[dict]:
+        plaintext = self.decrypt_raw(token)
+        if plaintext is None:
+            return None
         try:
-            return json.loads(self.cipher.decrypt(token).decode())
+            return orjson.loads(plaintext)
         except Exception:
             return None
     
@@ -207,15 +231,15 @@ class SecureSandbox:
     NO arbitrary code execution.
     """
     
-    ALLOWED_NODES = (
+    ALLOWED_NODES = frozenset({
         ast.Module, ast.Expr, ast.Expression,
         ast.BinOp, ast.UnaryOp, ast.Compare,
-        ast.Num, ast.Constant, ast.Name, ast.Load,
+        ast.Constant, ast.Name, ast.Load,
         ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow,
         ast.Mod, ast.FloorDiv, ast.USub, ast.UAdd,
         ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
         ast.Call, ast.List, ast.Tuple,
-    )
+    })
     
     ALLOWED_NAMES = {
         'abs': abs, 'round': round, 'min': min, 'max': max,
@@ -229,38 +253,104 @@ class SecureSandbox:
     }
     
     @classmethod
-    def validate_ast(cls, node) -> bool:
-        """Recursively validate AST nodes"""
-        if not isinstance(node, cls.ALLOWED_NODES):
-            return False
-        for child in ast.iter_child_nodes(node):
-            if not cls.validate_ast(child):
-                return False
-        return True
+    def validate_ast(cls, tree):
+        """
+        Validate all nodes in a single iterative walk.
+        Type-check and name-check together: one traversal, no Python-level
+        recursion, and frozenset membership on the exact node type is O(1)
+        instead of an isinstance tuple scan.
+        """
+        for node in ast.walk(tree):
+            if type(node) not in cls.ALLOWED_NODES:
+                raise SecurityError(f"Disallowed operation: {type(node).__name__}")
+            if isinstance(node, ast.Name) and node.id not in cls.ALLOWED_NAMES:
+                raise SecurityError(f"Unknown name: {node.id}")
     
+    # Optional JIT tier: expressions that stick to pure-numeric names are
+    # compiled to machine code with Numba once they repeat. Numba is never
+    # installed by genesis; if it's absent the tier silently stays off.
+    _NUMERIC_NAMES = frozenset({
+        'abs', 'round', 'min', 'max', 'pow', 'int', 'float',
+        'pi', 'e', 'tau', 'sqrt', 'sin', 'cos', 'tan',
+        'log', 'log10', 'exp', 'floor', 'ceil',
+    })
+    _njit_cache: Dict[str, Any] = {}
+    _njit_counts: Dict[str, int] = {}
+    _numba = None  # lazily imported on first JIT candidate
+
     @classmethod
-    def execute(cls, code: str, timeout: float = 5.0) -> Any:
+    def _maybe_jit(cls, code: str):
+        """After a validated expression repeats, try to JIT-compile it."""
+        count = cls._njit_counts.get(code, 0) + 1
+        cls._njit_counts[code] = count
+        if count != 2 or code in cls._njit_cache:
+            return
+        names = {n.id for n in ast.walk(ast.parse(code, mode='eval'))
+                 if isinstance(n, ast.Name)}
+        if not names <= cls._NUMERIC_NAMES:
+            cls._njit_cache[code] = None  # factorial/gcd/containers: object mode only
+            return
+        if cls._numba is None:
+            try:
+                import numba
+                cls._numba = numba
+            except ImportError:
+                cls._numba = False
+        if not cls._numba:
+            cls._njit_cache[code] = None
+            return
+        try:
+            ns = {n: cls.ALLOWED_NAMES[n] for n in names}
+            exec(compile(f"def _f():\n    return ({code})", '<sandbox-jit>', 'exec'), ns)
+            cls._njit_cache[code] = cls._numba.njit(cache=True)(ns['_f'])
+        except Exception:
+            cls._njit_cache[code] = None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _compile(code: str):
         """
-        Safely execute mathematical expressions.
-        Returns result or raises SecurityError.
+        Parse, validate and compile an expression, caching the code object.
+        In a swarm the same expression is re-broadcast constantly; a cache
+        hit skips the parse and validation walk entirely.
         """
+        cls = SecureSandbox
         try:
             tree = ast.parse(code, mode='eval')
         except SyntaxError as e:
             raise ValueError(f"Syntax error: {e}")
-        
-        if not cls.validate_ast(tree):
-            raise SecurityError("Disallowed operation in expression")
-        
-        # Check for forbidden names
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Name) and node.id not in cls.ALLOWED_NAMES:
-                raise SecurityError(f"Unknown name: {node.id}")
-        
+
+        cls.validate_ast(tree)
+        return compile(tree, '<sandbox>', 'eval')
+
+    @classmethod
+    def execute(cls, code: str, timeout: float = 5.0) -> Any:
+        """
+        Safely execute mathematical expressions.
+        Returns result or raises SecurityError.
+        """
+        # Literal fast path: plain numbers/tuples skip parse-validate-compile
+        # entirely (literal_eval only accepts constant expressions).
         try:
-            return eval(compile(tree, '<sandbox>', 'eval'), {"__builtins__": {}}, cls.ALLOWED_NAMES)
+            return ast.literal_eval(code)
+        except (ValueError, SyntaxError, TypeError):
+            pass
+
+        code = sys.intern(code)
+        jit_fn = cls._njit_cache.get(code)
+        if jit_fn is not None:
+            try:
+                return jit_fn()
+            except Exception:
+                cls._njit_cache[code] = None  # deopt to the interpreted path
+
+        code_obj = cls._compile(code)
+        try:
+            result = eval(code_obj, {"__builtins__": {}}, cls.ALLOWED_NAMES)
         except Exception as e:
             raise RuntimeError(f"Execution error: {e}")
+        cls._maybe_jit(code)
+        return result
 
 class SecurityError(Exception):
     pass
@@ -270,16 +360,32 @@ class SecurityError(Exception):
 # =============================================================================
 class HardwareMonitor:
     """Real-time hardware monitoring and capability reporting"""
-    
-    @staticmethod
-    def get_snapshot() -> dict:
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+
+    # Snapshots are served from a cache refreshed once a second by a daemon
+    # sampler; a fresh probe used to mean psutil.cpu_percent(interval=0.1)
+    # blocking for 100 ms plus memory/disk syscalls on every health query
+    # and broadcast.
+    _snapshot: dict = {}
+    _compact_cache = "?"
+    _sampler_started = False
+    _sampler_lock = threading.Lock()
+
+    @classmethod
+    def _start_sampler(cls):
+        with cls._sampler_lock:
+            if cls._sampler_started:
+                return
+            cls._sampler_started = True
+            psutil.cpu_percent(interval=None)  # prime the counter
+            threading.Thread(target=cls._sampler_loop, daemon=True).start()
+
+    @classmethod
+    def _sample(cls) -> dict:
         mem = psutil.virtual_memory()
         disk = psutil.disk_usage('/')
-        
-        return {
+        snap = {
             "cpu_count": psutil.cpu_count(logical=True),
-            "cpu_percent": cpu_percent,
+            "cpu_percent": psutil.cpu_percent(interval=None),
             "ram_total_gb": round(mem.total / (1024**3), 2),
             "ram_available_gb": round(mem.available / (1024**3), 2),
             "ram_percent": mem.percent,
@@ -288,11 +394,26 @@ class HardwareMonitor:
             "platform": f"{platform.system()} {platform.release()}",
             "python": platform.python_version(),
         }
-    
-    @staticmethod
-    def get_compact() -> str:
-        s = HardwareMonitor.get_snapshot()
-        return f"{s['cpu_count']}C/{s['ram_total_gb']}G/{s['cpu_percent']}%"
+        cls._snapshot = snap
+        cls._compact_cache = f"{snap['cpu_count']}C/{snap['ram_total_gb']}G/{snap['cpu_percent']}%"
+        return snap
+
+    @classmethod
+    def _sampler_loop(cls):
+        while True:
+            cls._sample()
+            time.sleep(1.0)
+
+    @classmethod
+    def get_snapshot(cls) -> dict:
+        cls._start_sampler()
+        snap = cls._snapshot or cls._sample()
+        return dict(snap)
+
+    @classmethod
+    def get_compact(cls) -> str:
+        cls._start_sampler()
+        return cls._compact_cache
 
 # =============================================================================
 # PHASE 6: DISTRIBUTED KEY-VALUE STORE
@@ -307,8 +428,10 @@ class DistributedStore:
         self.store_path = os.path.join(data_dir, "store.json")
         self.data: Dict[str, Any] = {}
         self.versions: Dict[str, int] = defaultdict(int)
-        self.lock = threading.RLock()
+        self.lock = threading.Lock()
+        self._dirty = threading.Event()
         self._load()
+        threading.Thread(target=self._flush_loop, daemon=True).start()
     
     def _load(self):
         if os.path.exists(self.store_path):
@@ -320,9 +443,21 @@ class DistributedStore:
             except Exception:
                 pass
     
-    def _save(self):
-        with open(self.store_path, 'w') as f:
-            json.dump({'data': self.data, 'versions': dict(self.versions)}, f)
+    def _flush_loop(self):
+        """Coalesce bursts of mutations into at most one disk write per 500 ms"""
+        while True:
+            self._dirty.wait()
+            time.sleep(0.5)
+            self._dirty.clear()
+            self._save_atomic()
+
+    def _save_atomic(self):
+        with self.lock:
+            payload = json.dumps({'data': self.data, 'versions': dict(self.versions)})
+        tmp_path = self.store_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(payload)
+        os.replace(tmp_path, self.store_path)
     
     def get(self, key: str) -> Optional[Any]:
         with self.lock:
@@ -335,15 +470,30 @@ class DistributedStore:
             if version >= self.versions[key]:
                 self.data[key] = value
                 self.versions[key] = version
-                self._save()
+                self._dirty.set()
             return self.versions[key]
     
+    def bulk_merge(self, incoming: dict):
+        """Merge a full STORE_SYNC payload under a single lock acquisition"""
+        data = incoming.get('data', {})
+        versions = incoming.get('versions', {})
+        with self.lock:
+            changed = False
+            for key, value in data.items():
+                version = versions.get(key, 0)
+                if version >= self.versions[key]:
+                    self.data[key] = value
+                    self.versions[key] = version
+                    changed = True
+            if changed:
+                self._dirty.set()
+
     def delete(self, key: str) -> bool:
         with self.lock:
             if key in self.data:
                 del self.data[key]
                 self.versions[key] += 1
-                self._save()
+                self._dirty.set()
                 return True
             return False
     
@@ -358,7 +508,7 @@ class DistributedStore:
 # =============================================================================
 # PHASE 7: TASK QUEUE & SCHEDULER
 # =============================================================================
-@dataclass
+@dataclass(slots=True)
 class Task:
     id: str
     code: str
@@ -376,8 +526,9 @@ class TaskScheduler:
     
     def __init__(self):
         self.queue: Dict[str, Task] = {}
-        self.lock = threading.RLock()
-    
+        self.pending: deque = deque()  # task IDs awaiting a worker
+        self.cond = threading.Condition()
+
     def submit(self, code: str, submitter: str) -> str:
         task_id = uuid.uuid4().hex[:12]
         task = Task(
@@ -386,21 +537,26 @@ class TaskScheduler:
             submitted_at=time.time(),
             submitted_by=submitter
         )
-        with self.lock:
+        with self.cond:
             self.queue[task_id] = task
+            self.pending.append(task_id)
+            self.cond.notify()
         return task_id
-    
-    def claim(self, executor: str) -> Optional[Task]:
-        with self.lock:
-            for task in self.queue.values():
-                if task.status == "pending":
-                    task.status = "running"
-                    task.executed_by = executor
-                    return task
-        return None
-    
+
+    def claim(self, executor: str) -> Task:
+        """Block until a pending task is available, then claim it"""
+        with self.cond:
+            while True:
+                while self.pending:
+                    task = self.queue.get(self.pending.popleft())
+                    if task and task.status == "pending":
+                        task.status = "running"
+                        task.executed_by = executor
+                        return task
+                self.cond.wait()
+
     def complete(self, task_id: str, result: Any, success: bool = True):
-        with self.lock:
+        with self.cond:
             if task_id in self.queue:
                 task = self.queue[task_id]
                 task.result = result
@@ -408,7 +564,7 @@ class TaskScheduler:
                 task.completed_at = time.time()
     
     def get_status(self, task_id: str) -> Optional[dict]:
-        with self.lock:
+        with self.cond:
             task = self.queue.get(task_id)
             if task:
                 return {
@@ -433,42 +589,47 @@ class DNAServer(threading.Thread):
         self.port = port
         self.swarm_key = swarm_key
         try:
-            with open(os.path.abspath(__file__), 'r') as f:
+            # Keep the source as bytes: every / request used to re-encode
+            # the whole file to a fresh bytes copy before writing it out.
+            with open(os.path.abspath(__file__), 'rb') as f:
                 self.source = f.read()
         except Exception:
-            self.source = "# Source unavailable"
+            self.source = b"# Source unavailable"
     
     def run(self):
         swarm_key = self.swarm_key
         source = self.source
         
         class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, code: int, ctype: str, body: bytes):
+                self.send_response(code)
+                self.send_header('Content-Type', ctype)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.wfile.write(body)
+                self.close_connection = True
+
             def do_GET(self):
                 if self.path == '/':
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'text/plain')
-                    self.end_headers()
-                    self.wfile.write(source.encode())
+                    self._send(200, 'text/plain', source)
                 elif self.path == '/key':
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'text/plain')
-                    self.end_headers()
-                    self.wfile.write(swarm_key.encode())
+                    self._send(200, 'text/plain', swarm_key.encode())
                 elif self.path == '/health':
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps(HardwareMonitor.get_snapshot()).encode())
+                    self._send(200, 'application/json',
+                               json.dumps(HardwareMonitor.get_snapshot()).encode())
                 else:
-                    self.send_response(404)
-                    self.end_headers()
-            
+                    self._send(404, 'text/plain', b'')
+
             def log_message(self, *args):
                 pass
-        
-        socketserver.TCPServer.allow_reuse_address = True
+
         try:
-            with socketserver.TCPServer(("", self.port), Handler) as httpd:
+            # ThreadingHTTPServer serves each request in its own thread so
+            # concurrent replication pulls don't queue behind one another.
+            with http.server.ThreadingHTTPServer(("", self.port), Handler) as httpd:
                 httpd.serve_forever()
         except Exception as e:
             print(f"[DNA] Server error: {e}")
@@ -476,8 +637,29 @@ class DNAServer(threading.Thread):
 # =============================================================================
 # PHASE 9: NETWORK UTILITIES
 # =============================================================================
+# Binary wire framing for high-frequency packets. The decrypted plaintext's
+# first byte distinguishes the formats: reserved op tags sit below 0x7b, and
+# JSON packets always start with '{' (0x7b). Only PING uses the binary path
+# today; EXEC/RESULT/STORE_SYNC still carry structured payloads as JSON.
+OP_PING = 0
+OP_EXEC = 1
+OP_RESULT = 2
+OP_STORE_SYNC = 3
+# op tag, node id, fingerprint, compact hw string (NUL-padded), timestamp
+PING_STRUCT = struct.Struct("!B8s16s24sd")
+
 def get_local_ip() -> str:
     """Find best local IP address"""
+    # UDP connect() never sends a packet but makes the kernel pick the
+    # outbound interface — one syscall instead of enumerating every NIC.
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))
+            ip = s.getsockname()[0]
+        if not ip.startswith("127."):
+            return ip
+    except OSError:
+        pass
     addrs = psutil.net_if_addrs()
     for iface, snics in addrs.items():
         for snic in snics:
@@ -507,22 +689,37 @@ class DeedoopKernel:
         
         # Initialize subsystems
         self.identity = NodeIdentity(CONFIG.data_dir)
+        self._fp = self.identity.get_fingerprint()
+        # Static packet fields never change; build them once
+        self._pkt_skel = {'src': CONFIG.node_id, 'fp': self._fp}
+        # Per-op packet builders are generated at init with src/fp/op baked
+        # in as constants, so each broadcast assembles its dict in a single
+        # display expression instead of splatting the skeleton at runtime.
+        self._encoders = {op: self._make_encoder(op)
+                          for op in ('EXEC', 'RESULT', 'STORE_SYNC')}
         self.store = DistributedStore(CONFIG.data_dir)
         self.scheduler = TaskScheduler()
         self.hw = HardwareMonitor()
         
         # Peer registry: {node_id: {ip, fingerprint, hw, last_seen, latency}}
         self.peers: Dict[str, dict] = {}
-        self.peers_lock = threading.RLock()
+        self.peers_lock = threading.Lock()
         
-        # Network setup
+        # Network setup. Frames carry a clear-text node-id tag ahead of the
+        # ciphertext so the listener can drop its own broadcasts (the node
+        # hears every one of them) without paying for an AEAD decrypt.
+        self._self_tag = CONFIG.node_id.encode()
+        # One listener socket only. SO_REUSEPORT load-balances unicast, but
+        # the kernel delivers a *broadcast* datagram to every socket in a
+        # reuseport group — and all swarm traffic here is broadcast, so N
+        # sockets would process (and answer) every packet N times.
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
         self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
         self.sock.bind(('', CONFIG.udp_port))
-        
+
         # Start services
-        threading.Thread(target=self._listener, daemon=True).start()
+        threading.Thread(target=self._listener, args=(self.sock,), daemon=True).start()
         threading.Thread(target=self._heartbeat, daemon=True).start()
         threading.Thread(target=self._worker_loop, daemon=True).start()
         DNAServer(CONFIG.http_port, self.identity.get_swarm_key_b64()).start()
@@ -550,15 +747,30 @@ class DeedoopKernel:
 """)
         print("Commands: exec <expr>, nodes, store, tasks, health, exit\n")
     
-    def _listener(self):
-        """UDP packet listener"""
+    def _listener(self, sock):
+        """UDP packet listener (one thread per listen socket)"""
         while True:
             try:
-                data, addr = self.sock.recvfrom(65535)
-                packet = self.identity.decrypt(data)
-                if not packet:
+                data, addr = sock.recvfrom(65535)
+                tag, sep, body = data.partition(b'|')
+                if not sep or tag == self._self_tag:
                     continue
-                
+                plain = self.identity.decrypt_raw(body)
+                if not plain:
+                    continue
+                if plain[0] == OP_PING:
+                    try:
+                        _, src_b, fp_b, hw_b, ts = PING_STRUCT.unpack(plain)
+                    except struct.error:
+                        continue
+                    packet = {'src': src_b.decode(), 'fp': fp_b.decode(),
+                              'hw': hw_b.rstrip(b'\0').decode(), 'ts': ts, 'op': 'PING'}
+                else:
+                    try:
+                        packet = orjson.loads(plain)
+                    except Exception:
+                        continue
+
                 src = packet.get('src')
                 if src == CONFIG.node_id:
                     continue
@@ -592,32 +804,56 @@ class DeedoopKernel:
                         print(f"[{src}] {status} {packet.get('result')}")
                 
                 elif op == 'STORE_SYNC':
-                    # Merge incoming store data
-                    incoming = packet.get('store', {})
-                    for key, value in incoming.get('data', {}).items():
-                        version = incoming.get('versions', {}).get(key, 0)
-                        self.store.set(key, value, version)
+                    # Merge incoming store data in one locked pass
+                    self.store.bulk_merge(packet.get('store', {}))
                 
             except Exception as e:
                 pass
     
+    def _make_encoder(self, op: str):
+        """Codegen a packet builder with this node's constants inlined"""
+        ns = {}
+        exec(
+            f"def _enc(hw, ts, extra):\n"
+            f"    return {{'src': {CONFIG.node_id!r}, 'fp': {self._fp!r}, "
+            f"'op': {op!r}, 'hw': hw, 'ts': ts, **extra}}\n",
+            ns,
+        )
+        return ns['_enc']
+
     def _broadcast(self, op: str, **kwargs):
         """Send encrypted broadcast packet"""
-        packet = {
-            'src': CONFIG.node_id,
-            'fp': self.identity.get_fingerprint(),
-            'op': op,
-            'hw': self.hw.get_compact(),
-            'ts': time.time(),
-            **kwargs
-        }
+        enc = self._encoders.get(op)
+        if enc is not None:
+            packet = enc(self.hw.get_compact(), time.time(), kwargs)
+        else:
+            packet = {
+                **self._pkt_skel,
+                'op': op,
+                'hw': self.hw.get_compact(),
+                'ts': time.time(),
+                **kwargs
+            }
         encrypted = self.identity.encrypt(packet)
-        self.sock.sendto(encrypted, ('<broadcast>', CONFIG.udp_port))
+        self.sock.sendto(self._self_tag + b'|' + encrypted, ('<broadcast>', CONFIG.udp_port))
     
     def _heartbeat(self):
         """Periodic heartbeat and peer cleanup"""
+        ping_cache = (0, b'')  # (wallclock second, ciphertext)
         while True:
-            self._broadcast('PING')
+            # PING contents only vary in ts, so quantize to the second and
+            # reuse the serialized+encrypted packet within that window.
+            now_s = int(time.time())
+            if now_s != ping_cache[0]:
+                payload = PING_STRUCT.pack(
+                    OP_PING,
+                    self._self_tag,
+                    self._fp.encode(),
+                    self.hw.get_compact().encode()[:24].ljust(24, b'\0'),
+                    float(now_s),
+                )
+                ping_cache = (now_s, self._self_tag + b'|' + self.identity.encrypt_raw(payload))
+            self.sock.sendto(ping_cache[1], ('<broadcast>', CONFIG.udp_port))
             
             # Cleanup stale peers
             now = time.time()
@@ -634,13 +870,11 @@ class DeedoopKernel:
         """Background worker for task execution"""
         while True:
             task = self.scheduler.claim(CONFIG.node_id)
-            if task:
-                try:
-                    result = SecureSandbox.execute(task.code)
-                    self.scheduler.complete(task.id, result, success=True)
-                except Exception as e:
-                    self.scheduler.complete(task.id, str(e), success=False)
-            time.sleep(0.1)
+            try:
+                result = SecureSandbox.execute(task.code)
+                self.scheduler.complete(task.id, result, success=True)
+            except Exception as e:
+                self.scheduler.complete(task.id, str(e), success=False)
     
     def execute_distributed(self, code: str):
         """Send code for distributed execution"""
@@ -52,13 +52,24 @@ Each box is a CAPABILITY — a self-describing quine fragment that:
 
 import sys,os,time,threading,json,uuid,socket,http.server,socketserver
 import platform,hashlib,base64,zlib,importlib,subprocess,queue
+import logging,logging.handlers
 from dataclasses import dataclass,field,asdict
 from typing import Dict,List,Any,Optional,Set,Callable,Tuple
-from collections import defaultdict
+from collections import defaultdict,OrderedDict
 from enum import Enum
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import struct,io,gzip,tempfile,shutil
+import struct,io,gzip,tempfile,shutil,atexit,signal,re
+
+# HTTP responses serialize through orjson (already bytes, 5-10x faster
+# than stdlib json) when it is installed, stdlib otherwise
+try:
+    import orjson
+    _dumps = lambda o: orjson.dumps(o, default=str)
+    _loads = orjson.loads
+except ImportError:
+    _dumps = lambda o: json.dumps(o, default=str).encode()
+    _loads = json.loads
 
 # =============================================================================
 # PHASE 1: MINIMAL BOOTSTRAP (This is the only "fixed" code)
@@ -67,9 +78,12 @@ import struct,io,gzip,tempfile,shutil
 
 def _ensure_deps():
     """Minimal dependency bootstrap"""
-    for lib,pip in[('psutil','psutil'),('cryptography','cryptography'),('requests','requests')]:
-        try:importlib.import_module(lib)
-        except ImportError:
+    # find_spec probes import metadata without executing the module —
+    # actually importing cryptography here would load its OpenSSL bindings
+    # twice over (once for the check, once for the real import below)
+    import importlib.util
+    for lib,pip in[('psutil','psutil'),('cryptography','cryptography'),('requests','requests'),('blake3','blake3'),('zstandard','zstandard')]:
+        if importlib.util.find_spec(lib) is None:
             subprocess.check_call([sys.executable,"-m","pip","install","-q",pip],
                 stdout=subprocess.DEVNULL,stderr=subprocess.DEVNULL)
             os.execv(sys.executable,['python']+sys.argv)
@@ -82,6 +96,18 @@ from cryptography.hazmat.primitives import hashes,serialization
 from cryptography.hazmat.primitives.asymmetric import rsa,padding
 from cryptography.hazmat.backends import default_backend
 
+# Hot-path logging: records go through a QueueHandler and the real
+# StreamHandler runs on a background QueueListener thread, so stream and
+# loader callbacks never contend on stdout; %-style args also defer the
+# formatting until a handler actually fires.
+log = logging.getLogger('hydra')
+if not log.handlers:
+    _log_queue: queue.Queue = queue.Queue(-1)
+    log.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+    _log_listener.start()
+    log.setLevel(logging.INFO)
+
 # =============================================================================
 # PHASE 2: CAPABILITY PRIMITIVES
 # =============================================================================
@@ -96,6 +122,10 @@ class CapabilityType(Enum):
     EXECUTOR = "executor"   # Job execution: python, script, container
     PLUGIN = "plugin"       # User-defined extensions
 
+# Direct value→member map: a dict hit instead of the enum's __call__
+# machinery on every manifest built from the wire or the CLI
+_TYPE_MAP = {t.value: t for t in CapabilityType}
+
 class CapabilityState(Enum):
     """Lifecycle states of a capability"""
     DECLARED = "declared"   # Known to exist
@@ -106,7 +136,7 @@ class CapabilityState(Enum):
     SUSPENDED = "suspended" # Temporarily disabled
     FAILED = "failed"       # Error state
 
-@dataclass
+@dataclass(slots=True)
 class CapabilityManifest:
     """
     Manifest describing a capability.
@@ -122,9 +152,10 @@ class CapabilityManifest:
     author: str = "Alexis Eleanor Fagan"
     
     # Code
-    genome: str = ""                  # Compressed source code
-    genome_hash: str = ""             # SHA256 of uncompressed source
+    genome: bytes = b""               # Compressed source code (raw bytes)
+    genome_hash: str = ""             # Short hash of uncompressed source
     genome_size: int = 0              # Uncompressed size
+    genome_crc: int = 0               # CRC32 of the compressed bytes
     
     # Metadata
     created: float = field(default_factory=time.time)
@@ -134,18 +165,36 @@ class CapabilityManifest:
     # Runtime
     entry_point: str = ""             # Function to call on activation
     exports: List[str] = field(default_factory=list)  # Exported symbols
-    
+
+    def __post_init__(self):
+        # CRC32 of the compressed blob is a near-free identity check
+        # (hardware CRC instruction); fill it for manifests built directly
+        if self.genome and not self.genome_crc:
+            self.genome_crc = zlib.crc32(self.genome)
+
     def to_dict(self) -> dict:
         d = asdict(self)
         d['type'] = self.type.value
+        # Genomes live as raw bytes in memory; base64 only at the JSON boundary
+        d['genome'] = base64.b64encode(self.genome).decode('ascii')
         return d
-    
+
     @classmethod
     def from_dict(cls, d: dict) -> 'CapabilityManifest':
         d['type'] = CapabilityType(d['type'])
+        if isinstance(d.get('genome'), str):
+            d['genome'] = base64.b64decode(d['genome'])
+        # Short strings repeat across hundreds of streamed manifests
+        # (ids, versions, authors) — intern once on ingest
+        for k in ('id', 'name', 'version', 'author'):
+            if isinstance(d.get(k), str):
+                d[k] = sys.intern(d[k])
+        for k in ('dependencies', 'provides', 'exports'):
+            if d.get(k):
+                d[k] = [sys.intern(s) for s in d[k]]
         return cls(**d)
 
-@dataclass
+@dataclass(slots=True)
 class Capability:
     """
     A loaded capability — a living quine fragment.
@@ -170,34 +219,103 @@ class Capability:
 # PHASE 3: CAPABILITY CODEC (Compress/Decompress Quine Fragments)
 # =============================================================================
 
+# zstd compresses several times faster than zlib-9 at a similar ratio and
+# decompresses ~3x faster; genomes stay raw bytes so there is no base64
+# inflation on the wire. zlib remains the fallback codec, and decompress
+# sniffs the frame magic so mixed-codec meshes interoperate.
+try:
+    import zstandard as zstd
+    _ZCTX_C = zstd.ZstdCompressor(level=6)
+    _ZCTX_D = zstd.ZstdDecompressor()
+except ImportError:
+    zstd = None
+    _ZCTX_C = _ZCTX_D = None
+
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# genome_hash only keeps 16 hex chars (64 bits of identifier), so a faster
+# hash suffices: BLAKE3 is SIMD-accelerated (~3-10x SHA256 on modern x86).
+# The hash is part of the wire format — receivers recompute it to verify
+# genomes — so blake3 is in the _ensure_deps bootstrap and every node
+# hashes identically; the import cannot fail after bootstrap.
+from blake3 import blake3 as _hash_fn
+
+def _short_hash(data: bytes) -> str:
+    """Short content hash used as the genome integrity tag"""
+    return _hash_fn(data).hexdigest()[:16]
+
 class CapabilityCodec:
     """Encode/decode capability quine fragments"""
-    
+
     @staticmethod
-    def compress(source: str) -> Tuple[str, str, int]:
+    def compress(source: str) -> Tuple[bytes, str, int]:
         """Compress source to genome, return (genome, hash, original_size)"""
         data = source.encode('utf-8')
-        compressed = zlib.compress(data, level=9)
-        genome = base64.b64encode(compressed).decode('ascii')
-        genome_hash = hashlib.sha256(data).hexdigest()[:16]
+        if _ZCTX_C is not None:
+            genome = _ZCTX_C.compress(data)
+        else:
+            genome = zlib.compress(data, level=9)
+        genome_hash = _short_hash(data)
         return genome, genome_hash, len(data)
-    
+
+    @staticmethod
+    def _streaming_decompress(genome: bytes) -> bytes:
+        """Incrementally inflate a genome in 64KB chunks.
+
+        One-shot decompress peaks at genome + full source in flight at
+        once; streaming through a decompressobj into a BytesIO keeps the
+        working set to a chunk at a time for large compute blobs.
+        """
+        if genome[:4] == _ZSTD_MAGIC:
+            d = _ZCTX_D.decompressobj()
+        else:
+            d = zlib.decompressobj()
+        out = io.BytesIO()
+        view = memoryview(genome)
+        for i in range(0, len(view), 1 << 16):
+            out.write(d.decompress(view[i:i + (1 << 16)]))
+        out.write(d.flush())
+        return out.getvalue()
+
     @staticmethod
-    def decompress(genome: str) -> str:
+    def decompress(genome: bytes) -> str:
         """Decompress genome back to source"""
         try:
-            data = base64.b64decode(genome.encode('ascii'))
-            return zlib.decompress(data).decode('utf-8')
+            return CapabilityCodec._streaming_decompress(genome).decode('utf-8')
         except Exception as e:
             raise ValueError(f"Failed to decompress genome: {e}")
-    
+
+    # Decompressed sources memoized by genome_hash (LRU, bounded). Keyed on
+    # the short content hash — not the genome blob — so the cache stays small.
+    _SOURCE_CACHE: "OrderedDict[str, str]" = OrderedDict()
+    _SOURCE_CACHE_MAX = 256
+
+    @classmethod
+    def load_verified(cls, genome: bytes, expected_hash: str) -> str:
+        """Decompress and verify in one pass, memoized by genome_hash.
+
+        Warm loads (hot-swap reverts, shared dependency activations) skip
+        both the decompress and the hash entirely.
+        """
+        cached = cls._SOURCE_CACHE.get(expected_hash)
+        if cached is not None:
+            cls._SOURCE_CACHE.move_to_end(expected_hash)
+            return cached
+        source = cls.decompress(genome)
+        actual_hash = _short_hash(source.encode('utf-8'))
+        if actual_hash != expected_hash:
+            raise ValueError(f"Genome integrity check failed (hash {expected_hash})")
+        cls._SOURCE_CACHE[expected_hash] = source
+        if len(cls._SOURCE_CACHE) > cls._SOURCE_CACHE_MAX:
+            cls._SOURCE_CACHE.popitem(last=False)
+        return source
+
     @staticmethod
-    def verify(genome: str, expected_hash: str) -> bool:
+    def verify(genome: bytes, expected_hash: str) -> bool:
         """Verify genome matches expected hash"""
         try:
             source = CapabilityCodec.decompress(genome)
-            actual_hash = hashlib.sha256(source.encode()).hexdigest()[:16]
-            return actual_hash == expected_hash
+            return _short_hash(source.encode()) == expected_hash
         except:
             return False
     
@@ -209,64 +327,88 @@ class CapabilityCodec:
         """Create a capability manifest from source code"""
         genome, genome_hash, genome_size = CapabilityCodec.compress(source)
         return CapabilityManifest(
-            id=id,
-            name=name,
+            id=sys.intern(id),
+            name=sys.intern(name),
             version="1.0.0",
             type=type,
             description=description or f"{name} capability",
-            dependencies=dependencies or [],
-            provides=provides or [id],
+            dependencies=[sys.intern(d) for d in (dependencies or [])],
+            provides=[sys.intern(p) for p in (provides or [id])],
             genome=genome,
             genome_hash=genome_hash,
             genome_size=genome_size,
             priority=priority,
             entry_point=entry_point,
-            exports=exports or []
+            exports=[sys.intern(e) for e in (exports or [])]
         )
 
 # =============================================================================
 # PHASE 4: CAPABILITY STREAM
 # =============================================================================
 
+def _safe_dispatch(callback: Callable, manifest: 'CapabilityManifest'):
+    """Invoke a stream subscriber, containing its exceptions"""
+    try:
+        callback(manifest)
+    except Exception as e:
+        log.warning("[STREAM] Subscriber error: %s", e)
+
 class CapabilityStream:
     """
     A stream of capabilities — the living DNA.
     Capabilities flow through this stream to be loaded and activated.
     """
     
+    _STOP = object()  # queue sentinel; wakes the drain loop on stop()
+
     def __init__(self):
         self._queue: queue.Queue = queue.Queue()
         self._subscribers: List[Callable[[CapabilityManifest], None]] = []
         self._lock = threading.RLock()
-        self._running = True
+        self._stopped = threading.Event()
+        # Fan subscriber callbacks out to a pool so one slow subscriber
+        # (e.g. a loader taking the registry write lock) can't stall the rest
+        self._exec = ThreadPoolExecutor(max_workers=4, thread_name_prefix='cap-sub')
         self._thread = threading.Thread(target=self._process_stream, daemon=True)
         self._thread.start()
-    
+
     def publish(self, manifest: CapabilityManifest):
         """Publish a capability to the stream"""
         self._queue.put(manifest)
-    
+
     def subscribe(self, callback: Callable[[CapabilityManifest], None]):
         """Subscribe to capability events"""
         with self._lock:
             self._subscribers.append(callback)
-    
+
     def _process_stream(self):
-        """Process incoming capabilities"""
-        while self._running:
-            try:
-                manifest = self._queue.get(timeout=1)
-                with self._lock:
-                    for callback in self._subscribers:
-                        try:
-                            callback(manifest)
-                        except Exception as e:
-                            print(f"[STREAM] Subscriber error: {e}")
-            except queue.Empty:
-                pass
-    
+        """Process incoming capabilities in batches"""
+        while not self._stopped.is_set():
+            item = self._queue.get()  # blocks until work or stop — no polling
+            if item is self._STOP:
+                break
+            # Drain whatever else is queued so burst publishes (e.g. the
+            # initial genome rollout) pay for one subscriber snapshot
+            # instead of a lock round-trip per manifest.
+            batch = [item]
+            while len(batch) < 64:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is self._STOP:
+                    self._stopped.set()
+                    break
+                batch.append(nxt)
+            with self._lock:
+                subs = list(self._subscribers)
+            for manifest in batch:
+                list(self._exec.map(lambda cb, m=manifest: _safe_dispatch(cb, m), subs))
+
     def stop(self):
-        self._running = False
+        self._stopped.set()
+        self._queue.put(self._STOP)
+        self._exec.shutdown(wait=False)
 
 # =============================================================================
 # PHASE 5: CAPABILITY REGISTRY
@@ -279,25 +421,54 @@ class CapabilityRegistry:
     """
     
     def __init__(self):
+        # Copy-on-write: readers do lock-free lookups on immutable snapshot
+        # dicts; register() rebuilds and atomically rebinds them under the
+        # write lock. Iteration therefore sees a point-in-time snapshot.
         self._manifests: Dict[str, CapabilityManifest] = {}
-        self._by_type: Dict[CapabilityType, List[str]] = defaultdict(list)
+        self._by_type: Dict[CapabilityType, Set[str]] = {}
         self._provides: Dict[str, str] = {}  # provided -> capability_id
-        self._lock = threading.RLock()
+        self._lock = threading.Lock()  # writers only
+        self._version = 0  # bumped on every successful register
+
+    @property
+    def version(self) -> int:
+        """Monotonic registry version — changes whenever the DAG changes"""
+        return self._version
     
     def register(self, manifest: CapabilityManifest) -> bool:
         """Register a capability manifest"""
         with self._lock:
-            if manifest.id in self._manifests:
-                existing = self._manifests[manifest.id]
-                if existing.genome_hash == manifest.genome_hash:
-                    return False  # Already registered, same version
-            
-            self._manifests[manifest.id] = manifest
-            self._by_type[manifest.type].append(manifest.id)
-            
+            existing = self._manifests.get(manifest.id)
+            # Cheap int compare first: identical compressed payloads bail
+            # before the hash strings are even looked at
+            if existing and existing.genome_crc == manifest.genome_crc \
+               and existing.genome_hash == manifest.genome_hash:
+                return False  # Already registered, same version
+
+            manifests = dict(self._manifests)
+            manifests[manifest.id] = manifest
+
+            by_type = {t: set(ids) for t, ids in self._by_type.items()}
+            by_type.setdefault(manifest.type, set()).add(manifest.id)
+            if existing and existing.type != manifest.type:
+                by_type.get(existing.type, set()).discard(manifest.id)
+
+            provides = dict(self._provides)
+            if existing:
+                # Drop requirements the old version provided but the new
+                # version no longer does
+                for provided in existing.provides:
+                    if provided not in manifest.provides and \
+                       provides.get(provided) == manifest.id:
+                        del provides[provided]
             for provided in manifest.provides:
-                self._provides[provided] = manifest.id
-            
+                provides[provided] = manifest.id
+
+            # Rebind atomically — readers see either the old or new snapshot
+            self._manifests = manifests
+            self._by_type = by_type
+            self._provides = provides
+            self._version += 1
             return True
     
     def get(self, id: str) -> Optional[CapabilityManifest]:
@@ -309,14 +480,13 @@ class CapabilityRegistry:
         return self._provides.get(requirement)
     
     def list_by_type(self, type: CapabilityType) -> List[CapabilityManifest]:
-        """List all capabilities of a type"""
-        with self._lock:
-            return [self._manifests[id] for id in self._by_type.get(type, [])]
-    
+        """List all capabilities of a type (snapshot)"""
+        manifests = self._manifests
+        return [manifests[id] for id in self._by_type.get(type, [])]
+
     def all(self) -> List[CapabilityManifest]:
-        """Get all registered manifests"""
-        with self._lock:
-            return list(self._manifests.values())
+        """Get all registered manifests (snapshot)"""
+        return list(self._manifests.values())
     
     def export(self) -> List[dict]:
         """Export all manifests for transmission"""
@@ -332,54 +502,76 @@ class CapabilityResolver:
     Builds a DAG of capabilities and determines load order.
     """
     
+    _CACHE_MAX = 1024
+
     def __init__(self, registry: CapabilityRegistry):
         self.registry = registry
-    
+        # Resolved load orders memoized per (root, registry version); any
+        # register() bump invalidates by changing the key. LRU-bounded like
+        # the codec's source cache — entries for superseded versions can
+        # never hit again, so they must age out rather than pile up on a
+        # long-lived node absorbing capability announces.
+        self._cache: "OrderedDict[Tuple[str, int], List[str]]" = OrderedDict()
+
+    def _canonical(self, id: str) -> str:
+        """Map a requirement to the capability that satisfies it"""
+        if self.registry.get(id) is not None:
+            return id
+        provider = self.registry.find_provider(id)
+        if provider:
+            return provider
+        raise ValueError(f"Cannot resolve capability: {id}")
+
     def resolve(self, capability_id: str) -> List[str]:
         """
         Resolve all dependencies for a capability.
         Returns list of capability IDs in load order.
+
+        Iterative DFS with grey-set cycle detection: no RecursionError on
+        deep chains, and a cyclic genome raises a clean ValueError.
         """
-        result = []
-        visited = set()
-        
-        def visit(id: str):
-            if id in visited:
-                return
-            visited.add(id)
-            
-            manifest = self.registry.get(id)
-            if not manifest:
-                # Try to find a provider
-                provider = self.registry.find_provider(id)
-                if provider:
-                    manifest = self.registry.get(provider)
-                    id = provider
-            
-            if not manifest:
-                raise ValueError(f"Cannot resolve capability: {id}")
-            
-            # Visit dependencies first
-            for dep in manifest.dependencies:
-                visit(dep)
-            
-            result.append(id)
-        
-        visit(capability_id)
-        return result
-    
+        key = (capability_id, self.registry.version)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return list(cached)
+
+        result: List[str] = []
+        done: Set[str] = set()   # fully resolved (black)
+        path: Set[str] = set()   # on the current DFS path (grey)
+
+        root = self._canonical(capability_id)
+        path.add(root)
+        stack = [(root, iter(self.registry.get(root).dependencies))]
+
+        while stack:
+            node, deps = stack[-1]
+            for dep in deps:
+                dep = self._canonical(dep)
+                if dep in done:
+                    continue
+                if dep in path:
+                    raise ValueError(f"Dependency cycle: {dep} -> {node}")
+                path.add(dep)
+                stack.append((dep, iter(self.registry.get(dep).dependencies)))
+                break
+            else:
+                stack.pop()
+                path.discard(node)
+                done.add(node)
+                result.append(node)
+
+        self._cache[key] = result
+        if len(self._cache) > self._CACHE_MAX:
+            self._cache.popitem(last=False)
+        return list(result)
+
     def resolve_all(self, capability_ids: List[str]) -> List[str]:
         """Resolve multiple capabilities, returning unified load order"""
-        all_deps = []
-        seen = set()
-        
+        merged: Dict[str, None] = {}
         for id in capability_ids:
-            for dep in self.resolve(id):
-                if dep not in seen:
-                    seen.add(dep)
-                    all_deps.append(dep)
-        
-        return all_deps
+            merged.update(dict.fromkeys(self.resolve(id)))
+        return list(merged)
 
 # =============================================================================
 # PHASE 7: CAPABILITY LOADER (The Heart of the Hydra)
@@ -398,6 +590,7 @@ class CapabilityLoader:
         
         self._loaded: Dict[str, Capability] = {}
         self._active: Dict[str, Capability] = {}
+        self._code_cache: Dict[str, Any] = {}  # genome_hash -> code object
         self._lock = threading.RLock()
         
         # Subscribe to stream
@@ -412,7 +605,7 @@ class CapabilityLoader:
     def _on_capability_received(self, manifest: CapabilityManifest):
         """Handle incoming capability from stream"""
         if self.registry.register(manifest):
-            print(f"[HYDRA] Received capability: {manifest.name} ({manifest.id})")
+            log.info("[HYDRA] Received capability: %s (%s)", manifest.name, manifest.id)
     
     def load(self, capability_id: str) -> Capability:
         """Load a capability (decompress and prepare)"""
@@ -424,13 +617,12 @@ class CapabilityLoader:
             if not manifest:
                 raise ValueError(f"Unknown capability: {capability_id}")
             
-            # Verify integrity
-            if not CapabilityCodec.verify(manifest.genome, manifest.genome_hash):
+            # Verify + decompress in one memoized pass (warm loads skip both)
+            try:
+                source = CapabilityCodec.load_verified(manifest.genome, manifest.genome_hash)
+            except ValueError:
                 raise ValueError(f"Genome integrity check failed: {capability_id}")
             
-            # Decompress
-            source = CapabilityCodec.decompress(manifest.genome)
-            
             capability = Capability(
                 manifest=manifest,
                 state=CapabilityState.LOADED,
@@ -460,15 +652,22 @@ class CapabilityLoader:
     def _activate_single(self, capability: Capability):
         """Activate a single capability"""
         try:
-            # Create isolated namespace with access to shared symbols
-            namespace = {
-                **self._shared_namespace,
-                '__capability_id__': capability.id,
-                '__capability_manifest__': capability.manifest,
-            }
+            # Create isolated namespace with access to shared symbols.
+            # dict() + C-level update beats the {**...} splat, which walks
+            # the growing shared namespace through bytecode per activation.
+            namespace = dict(self._shared_namespace)
+            namespace['__capability_id__'] = capability.id
+            namespace['__capability_manifest__'] = capability.manifest
             
-            # Execute the capability code
-            exec(capability.source, namespace)
+            # Execute the capability code, compiled once per genome —
+            # re-activation and hot-swap reverts skip parse/compile, and
+            # tracebacks get a meaningful filename
+            ghash = capability.manifest.genome_hash
+            code = self._code_cache.get(ghash)
+            if code is None:
+                code = compile(capability.source, f"<cap:{capability.id}>", 'exec')
+                self._code_cache[ghash] = code
+            exec(code, namespace)
             
             # Store namespace
             capability.namespace = namespace
@@ -556,9 +755,20 @@ import hashlib
 import base64
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.backends import default_backend
 
+# orjson serializes swarm messages 5-10x faster than stdlib json and
+# returns bytes directly; encrypt/decrypt sit on the broadcast hot path.
+try:
+    import orjson
+    _dumps = lambda o: orjson.dumps(o, default=str)
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _dumps = lambda o: json.dumps(o, default=str).encode()
+    _loads = json.loads
+
 class NodeIdentity:
     def __init__(self, data_dir):
         self.dir = data_dir
@@ -575,7 +785,12 @@ class NodeIdentity:
             with open(pp, "rb") as f:
                 self.pub = serialization.load_pem_public_key(f.read(), default_backend())
         else:
-            self.priv = rsa.generate_private_key(65537, 2048, default_backend())
+            # Ed25519 keygen takes microseconds vs ~100-500ms for RSA-2048,
+            # so first boot no longer stalls on the identity step. The key
+            # only feeds fingerprinting and swarm-key distribution, and
+            # load_pem_private_key above is format-agnostic so existing
+            # RSA keypairs keep working.
+            self.priv = ed25519.Ed25519PrivateKey.generate()
             self.pub = self.priv.public_key()
             with open(kp, "wb") as f:
                 f.write(self.priv.private_bytes(
@@ -606,13 +821,11 @@ class NodeIdentity:
             serialization.PublicFormat.SubjectPublicKeyInfo)).hexdigest()[:16]
     
     def encrypt(self, data):
-        import json
-        return self.cipher.encrypt(json.dumps(data, default=str).encode())
-    
+        return self.cipher.encrypt(_dumps(data))
+
     def decrypt(self, token):
-        import json
         try:
-            return json.loads(self.cipher.decrypt(token).decode())
+            return _loads(self.cipher.decrypt(token))
         except:
             return None
     
@@ -657,9 +870,23 @@ CAP_CORE_HARDWARE = '''
 # Provides: Hardware detection and monitoring
 # =============================================================================
 import subprocess
+import time
 import psutil
 from dataclasses import dataclass
 
+def ttl_cache(seconds):
+    """Memoize a zero-arg probe for `seconds` — these fork subprocesses"""
+    def deco(fn):
+        state = {'value': None, 'expiry': 0.0}
+        def wrapper():
+            now = time.time()
+            if now >= state['expiry']:
+                state['value'] = fn()
+                state['expiry'] = now + seconds
+            return state['value']
+        return wrapper
+    return deco
+
 @dataclass
 class NodeResources:
     cpu_total: int = 0
@@ -679,14 +906,15 @@ class HardwareProbe:
     @staticmethod
     def gpus():
         try:
-            r = subprocess.run(['nvidia-smi', '--query-gpu=count,memory.total',
+            # One invocation answers count, memory and driver — each
+            # nvidia-smi fork costs ~50-150ms of process startup
+            r = subprocess.run(['nvidia-smi', '--query-gpu=memory.total,driver_version',
                 '--format=csv,noheader,nounits'], capture_output=True, text=True, timeout=5)
             if r.returncode == 0:
-                lines = r.stdout.strip().split("\\n")
-                mem = sum(float(l.split(",")[1].strip())/1024 for l in lines if "," in l)
-                cv = subprocess.run(['nvidia-smi', '--query-gpu=driver_version',
-                    '--format=csv,noheader'], capture_output=True, text=True, timeout=5)
-                return len(lines), mem, cv.stdout.strip().split("\\n")[0] if cv.returncode == 0 else "", True
+                lines = [l for l in r.stdout.strip().split("\\n") if "," in l]
+                if lines:
+                    mem = sum(float(l.split(",")[0].strip())/1024 for l in lines)
+                    return len(lines), mem, lines[0].split(",")[1].strip(), True
         except:
             pass
         return 0, 0.0, "", False
@@ -707,17 +935,30 @@ class HardwareProbe:
             return False
     
     @staticmethod
-    def snapshot():
-        cpu = psutil.cpu_count(logical=True)
-        mem = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+    @ttl_cache(300)
+    def _probe_binaries():
+        # Installed binaries and driver versions change on the order of
+        # minutes; cache so heartbeats stop forking nvidia-smi/docker/blender
         gc, gm, cv, nv = HardwareProbe.gpus()
+        return gc, gm, cv, nv, HardwareProbe.docker(), HardwareProbe.blender()
+
+    @staticmethod
+    @ttl_cache(2)
+    def _probe_dynamic():
+        return (psutil.cpu_count(logical=True),
+                psutil.virtual_memory(),
+                psutil.disk_usage('/'))
+
+    @staticmethod
+    def snapshot():
+        cpu, mem, disk = HardwareProbe._probe_dynamic()
+        gc, gm, cv, nv, has_docker, has_blender = HardwareProbe._probe_binaries()
         return NodeResources(
             cpu, cpu,
             round(mem.total/(1024**3), 2), round(mem.available/(1024**3), 2),
             gc, gc,
             round(disk.total/(1024**3), 2), round(disk.free/(1024**3), 2),
-            HardwareProbe.docker(), nv, HardwareProbe.blender(), cv
+            has_docker, nv, has_blender, cv
         )
     
     @staticmethod
@@ -739,88 +980,281 @@ CAP_NETWORK_MESH = '''
 # CAPABILITY: network.mesh
 # Provides: P2P mesh networking, peer discovery, broadcast
 # =============================================================================
+import os
 import socket
 import threading
 import time
 import json
+import ctypes
+import ctypes.util
+import hashlib
+import heapq
+import select
 from dataclasses import asdict
 
+# Batched UDP receive: recvmmsg drains up to _RX_BATCH datagrams in one
+# syscall instead of one recvfrom per packet, so ingest cost amortizes
+# kernel entry/exit across the whole batch. All buffers are allocated
+# once per listener and reused for the process lifetime.
+_RX_BATCH = 32
+_RX_BUFLEN = 65535
+_MSG_DONTWAIT = 0x40
+
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    _libc.recvmmsg  # probe — absent on non-Linux libcs
+except (OSError, AttributeError):
+    _libc = None
+
+class _iovec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+class _msghdr(ctypes.Structure):
+    _fields_ = [('msg_name', ctypes.c_void_p), ('msg_namelen', ctypes.c_uint),
+                ('msg_iov', ctypes.POINTER(_iovec)), ('msg_iovlen', ctypes.c_size_t),
+                ('msg_control', ctypes.c_void_p), ('msg_controllen', ctypes.c_size_t),
+                ('msg_flags', ctypes.c_int)]
+
+class _mmsghdr(ctypes.Structure):
+    _fields_ = [('msg_hdr', _msghdr), ('msg_len', ctypes.c_uint)]
+
+class _BatchReceiver:
+    """recvmmsg-backed batch reader with a recvfrom fallback"""
+    def __init__(self, sock):
+        self.sock = sock
+        self.ok = _libc is not None
+        if not self.ok:
+            # Fallback path reads into one preallocated buffer instead of
+            # letting recvfrom allocate a fresh 64 KB bytes per packet
+            self._rxbuf = bytearray(_RX_BUFLEN)
+            self._rxmv = memoryview(self._rxbuf)
+            return
+        self._bufs = (ctypes.c_char * (_RX_BUFLEN * _RX_BATCH))()
+        self._names = (ctypes.c_char * (16 * _RX_BATCH))()  # sockaddr_in
+        self._iovecs = (_iovec * _RX_BATCH)()
+        self._hdrs = (_mmsghdr * _RX_BATCH)()
+        base = ctypes.addressof(self._bufs)
+        nbase = ctypes.addressof(self._names)
+        for i in range(_RX_BATCH):
+            self._iovecs[i].iov_base = base + i * _RX_BUFLEN
+            self._iovecs[i].iov_len = _RX_BUFLEN
+            h = self._hdrs[i].msg_hdr
+            h.msg_name = nbase + i * 16
+            h.msg_namelen = 16
+            h.msg_iov = ctypes.pointer(self._iovecs[i])
+            h.msg_iovlen = 1
+
+    def recv_batch(self):
+        """Block for traffic, then return a list of (data, addr)"""
+        if not self.ok:
+            n, addr = self.sock.recvfrom_into(self._rxbuf)
+            return [(bytes(self._rxmv[:n]), addr)]
+        select.select([self.sock], [], [])
+        got = _libc.recvmmsg(self.sock.fileno(), self._hdrs, _RX_BATCH,
+                             _MSG_DONTWAIT, None)
+        if got <= 0:
+            return []
+        out = []
+        base = ctypes.addressof(self._bufs)
+        names = bytes(self._names)
+        for i in range(got):
+            data = ctypes.string_at(base + i * _RX_BUFLEN, self._hdrs[i].msg_len)
+            sa = names[i * 16:(i + 1) * 16]
+            addr = (socket.inet_ntoa(sa[4:8]), (sa[2] << 8) | sa[3])
+            out.append((data, addr))
+            self._hdrs[i].msg_hdr.msg_namelen = 16  # kernel shrinks it; reset
+        return out
+
+class PeerState:
+    """Per-peer record; slots keep it one compact object, not a dict"""
+    __slots__ = ('ip', 'data', 'seen', 'caps', 'pushed')
+
+    def __init__(self, ip, data, seen, caps):
+        self.ip = ip
+        self.data = data
+        self.seen = seen
+        self.caps = caps
+        self.pushed = seen
+
+    def to_dict(self):
+        """Serializable view ('pushed' is internal sweep state)"""
+        return {'ip': self.ip, 'data': self.data,
+                'seen': self.seen, 'caps': self.caps}
+
 class MeshNetwork:
     def __init__(self, identity, config, on_packet=None):
         self.identity = identity
         self.config = config
         self.on_packet = on_packet
-        self.peers = {}
-        self.peers_lock = threading.RLock()
+        # Copy-on-write peer table: the hot path reads _peers_snapshot with
+        # no lock (one attribute load); writers rebuild and rebind under
+        # _peers_lock. Packets from already-known peers refresh 'seen' in
+        # place, so the rebuild only happens on peer arrival/departure.
+        self._peers_snapshot = {}
+        self._peers_lock = threading.Lock()
+        # Lazy min-heap of (seen, peer_id): the stale sweep pops only
+        # entries past the cutoff instead of scanning every peer per tick;
+        # outdated entries are dropped when the peer's real seen is newer
+        self._seen_heap = []
+        self._heap_lock = threading.Lock()
+        # Bound method skips the module attribute chain on every packet
+        self._now = time.time
         
+        # One listener socket only: SO_REUSEPORT load-balances unicast,
+        # but a broadcast datagram is delivered to every socket in the
+        # reuseport group, and all mesh traffic here is broadcast — extra
+        # sockets would just process every packet N times over.
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
         self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        # Deep kernel buffers on both sides: the send buffer absorbs
+        # announce fan-out bursts without blocking the broadcaster, and
+        # the receive buffer rides out listener stalls between recvmmsg
+        # drains instead of dropping packets
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4 << 20)
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 << 20)
+        except OSError:
+            pass
         self.sock.bind(('', config.udp_port))
+        # Resolve the broadcast destination once and bind sendto so each
+        # broadcast skips the tuple re-resolution and attribute lookup
+        self._bcast_addr = ('<broadcast>', config.udp_port)
+        self._sendto = self.sock.sendto
+        # Every node hears its own broadcasts; an 8-byte plaintext source
+        # tag ahead of the ciphertext lets the listener drop them before
+        # paying for a decrypt
+        self._self_tag = hashlib.blake2b(config.node_id.encode(),
+                                         digest_size=8).digest()
+        # Coalescing buffers for bursty ops (capability announces/responses)
+        self._batch_buf = {}
+        self._batch_lock = threading.Lock()
         
         self._running = True
         threading.Thread(target=self._listen, daemon=True).start()
         threading.Thread(target=self._heartbeat, daemon=True).start()
-    
+
     def _listen(self):
+        rx = _BatchReceiver(self.sock)
         while self._running:
             try:
-                data, addr = self.sock.recvfrom(65535)
-                pkt = self.identity.decrypt(data)
-                if not pkt or pkt.get('src') == self.config.node_id:
-                    continue
-                
-                src = pkt['src']
-                with self.peers_lock:
-                    is_new = src not in self.peers
-                    self.peers[src] = {
-                        'ip': addr[0],
-                        'data': pkt.get('data', {}),
-                        'seen': time.time(),
-                        'caps': pkt.get('caps', [])
-                    }
-                    if is_new:
-                        print(f"[MESH] + {src} ({addr[0]})")
-                
-                if self.on_packet:
-                    self.on_packet(pkt, addr)
-                    
+                for data, addr in rx.recv_batch():
+                    self._handle(data, addr)
             except Exception as e:
                 pass
+
+    def _handle(self, data, addr):
+        if data[:8] == self._self_tag:
+            return  # own broadcast — skip the decrypt entirely
+        pkt = self.identity.decrypt(data[8:])
+        if not pkt or pkt.get('src') == self.config.node_id:
+            return
+
+        src = pkt['src']
+        now = self._now()
+        cur = self._peers_snapshot.get(src)  # lock-free read
+        if cur is not None:
+            cur.ip = addr[0]  # peers can come back on a new address
+            cur.seen = now
+            cur.data = pkt.get('data', {})
+            cur.caps = pkt.get('caps', [])
+            # Re-arm the sweep heap at most once a second per peer
+            if now - cur.pushed >= 1.0:
+                cur.pushed = now
+                with self._heap_lock:
+                    heapq.heappush(self._seen_heap, (now, src))
+        else:
+            with self._peers_lock:
+                new = dict(self._peers_snapshot)
+                new[src] = PeerState(addr[0], pkt.get('data', {}), now,
+                                     pkt.get('caps', []))
+                self._peers_snapshot = new
+            with self._heap_lock:
+                heapq.heappush(self._seen_heap, (now, src))
+            print(f"[MESH] + {src} ({addr[0]})")
+
+        if self.on_packet:
+            self.on_packet(pkt, addr)
     
     def broadcast(self, op, **data):
         pkt = {
             'src': self.config.node_id,
             'op': op,
-            'ts': time.time(),
+            'ts': self._now(),
             'data': data
         }
         encrypted = self.identity.encrypt(pkt)
-        self.sock.sendto(encrypted, ('<broadcast>', self.config.udp_port))
-    
+        self._sendto(self._self_tag + encrypted, self._bcast_addr)
+
+    def broadcast_batched(self, op, items_key, item, delay=0.05):
+        """Coalesce items for `op` into one broadcast per 50ms window.
+
+        N concurrent announces become a single encrypt+sendto carrying
+        the aggregated list instead of a packet storm.
+        """
+        with self._batch_lock:
+            buf = self._batch_buf.setdefault((op, items_key), [])
+            buf.append(item)
+            if len(buf) == 1:
+                threading.Timer(delay, self._flush_batch, (op, items_key)).start()
+
+    def _flush_batch(self, op, items_key):
+        with self._batch_lock:
+            items = self._batch_buf.pop((op, items_key), [])
+        if items:
+            self.broadcast(op, **{items_key: items})
+
     def _heartbeat(self):
+        ping_cache = (0, b'')  # (wallclock second, encrypted frame)
         while self._running:
-            self.broadcast('PING')
-            
-            # Cleanup stale peers
-            now = time.time()
-            with self.peers_lock:
-                stale = [p for p, d in self.peers.items() if now - d['seen'] > self.config.timeout]
-                for p in stale:
-                    print(f"[MESH] - {p} (timeout)")
-                    del self.peers[p]
-            
+            # The PING payload only varies in ts; quantize to the second and
+            # reuse the serialized+encrypted frame inside that window
+            now_s = int(self._now())
+            if now_s != ping_cache[0]:
+                ping_cache = (now_s, self._self_tag + self.identity.encrypt(
+                    {'src': self.config.node_id, 'op': 'PING',
+                     'ts': now_s, 'data': {}}))
+            self._sendto(ping_cache[1], self._bcast_addr)
+
+            # Cleanup stale peers: pop heap entries past the cutoff and
+            # lazily discard ones superseded by a fresher 'seen'
+            cutoff = self._now() - self.config.timeout
+            expired = []
+            with self._heap_lock:
+                heap = self._seen_heap
+                while heap and heap[0][0] < cutoff:
+                    ts, pid = heapq.heappop(heap)
+                    d = self._peers_snapshot.get(pid)
+                    if d is None:
+                        continue
+                    if d.seen < cutoff:
+                        expired.append(pid)
+                    else:
+                        # Superseded entry: the push throttle means seen
+                        # can be newer than any queued entry, so re-arm
+                        # at the real timestamp or a now-silent peer
+                        # would never be swept
+                        heapq.heappush(heap, (d.seen, pid))
+            if expired:
+                with self._peers_lock:
+                    fresh = dict(self._peers_snapshot)
+                    for pid in expired:
+                        d = fresh.get(pid)
+                        if d is not None and d.seen < cutoff:
+                            print(f"[MESH] - {pid} (timeout)")
+                            del fresh[pid]
+                    self._peers_snapshot = fresh
+
             time.sleep(self.config.heartbeat)
-    
+
     def stop(self):
         self._running = False
-    
+
     def peer_count(self):
-        return len(self.peers)
-    
+        return len(self._peers_snapshot)
+
     def get_peers(self):
-        with self.peers_lock:
-            return dict(self.peers)
+        return self._peers_snapshot  # snapshot dict; treat as read-only
 
 MESH_CLASS = MeshNetwork
 '''
@@ -832,12 +1266,22 @@ CAP_COMPUTE_CONTAINER = '''
 # =============================================================================
 import subprocess
 import os
+import queue
+import atexit
+import threading
 
 class ContainerRuntime:
     def __init__(self, work_dir):
         self.work_dir = work_dir
         self.rt = self._detect()
-    
+        # Warm worker pool: docker run pays for the full
+        # dockerd/containerd/shim/runc tree (hundreds of ms) per job, an
+        # exec against a long-lived container costs a few ms. Containers
+        # are keyed by (image, limits) and kept alive with tail -f.
+        self._pool = {}
+        self._pool_lock = threading.Lock()
+        atexit.register(self._drain_pool)
+
     def _detect(self):
         for rt in ['docker', 'podman']:
             try:
@@ -860,35 +1304,90 @@ class ContainerRuntime:
         except:
             return False
     
+    def _acquire(self, image, gpu, cpu, ram):
+        """Pop an idle worker container or start a fresh one"""
+        key = (image, cpu, ram, gpu)
+        with self._pool_lock:
+            q = self._pool.setdefault(key, queue.Queue())
+        try:
+            return key, q.get_nowait()
+        except queue.Empty:
+            pass
+        cmd = [self.rt, 'run', '-d', '--rm',
+               '--cpus', str(cpu), '--memory', f'{ram}g',
+               '-v', f'{self.work_dir}:/work']
+        if gpu and self.rt == 'docker':
+            cmd.extend(['--gpus', 'all'])
+        cmd.extend(['--entrypoint', 'sh', image, '-c', 'tail -f /dev/null'])
+        r = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        if r.returncode != 0:
+            raise RuntimeError(r.stderr.strip() or "container start failed")
+        return key, r.stdout.strip()
+
+    def _release(self, key, cid):
+        self._pool[key].put(cid)
+
+    def _drain_pool(self):
+        for q in self._pool.values():
+            while True:
+                try:
+                    cid = q.get_nowait()
+                except queue.Empty:
+                    break
+                subprocess.run([self.rt, 'rm', '-f', cid], capture_output=True)
+
     def run(self, job_id, image, command=None, env=None, gpu=False, cpu=1, ram=1, timeout=3600):
         if not self.rt:
             return 1, "", "No container runtime"
-        
-        cmd = [self.rt, 'run', '--rm']
-        cmd.extend(['--cpus', str(cpu)])
-        cmd.extend(['--memory', f'{ram}g'])
-        
-        if gpu and self.rt == 'docker':
-            cmd.extend(['--gpus', 'all'])
-        
-        for k, v in (env or {}).items():
-            cmd.extend(['-e', f'{k}={v}'])
-        
+
         jd = os.path.join(self.work_dir, job_id)
         os.makedirs(jd, exist_ok=True)
-        cmd.extend(['-v', f'{jd}:/work', '-w', '/work'])
-        
-        cmd.append(image)
-        if command:
-            cmd.extend(command if isinstance(command, list) else command.split())
-        
+
+        if not command:
+            # exec needs an explicit command; images relying on their
+            # default CMD still go through a one-shot run
+            cmd = [self.rt, 'run', '--rm', '--cpus', str(cpu),
+                   '--memory', f'{ram}g', '-v', f'{jd}:/work', '-w', '/work']
+            if gpu and self.rt == 'docker':
+                cmd.extend(['--gpus', 'all'])
+            for k, v in (env or {}).items():
+                cmd.extend(['-e', f'{k}={v}'])
+            cmd.append(image)
+            try:
+                r = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+                return r.returncode, r.stdout, r.stderr
+            except subprocess.TimeoutExpired:
+                return -1, "", "Timeout"
+            except Exception as e:
+                return 1, "", str(e)
+
+        try:
+            key, cid = self._acquire(image, gpu, cpu, ram)
+        except Exception as e:
+            return 1, "", str(e)
+
+        cmd = [self.rt, 'exec', '-w', f'/work/{job_id}']
+        for k, v in (env or {}).items():
+            cmd.extend(['-e', f'{k}={v}'])
+        cmd.append(cid)
+        cmd.extend(command if isinstance(command, list) else command.split())
+
         try:
             r = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
-            return r.returncode, r.stdout, r.stderr
         except subprocess.TimeoutExpired:
+            subprocess.run([self.rt, 'rm', '-f', cid], capture_output=True)
             return -1, "", "Timeout"
         except Exception as e:
+            self._release(key, cid)
             return 1, "", str(e)
+        if r.returncode in (125, 126):
+            # exec itself failed — the worker is dead (OOM-kill, daemon
+            # restart; --rm then auto-removes it) or wedged. Discard it
+            # instead of recycling a corpse every job would inherit.
+            subprocess.run([self.rt, 'rm', '-f', cid], capture_output=True)
+        else:
+            self._release(key, cid)
+        return r.returncode, r.stdout, r.stderr
 
 CONTAINER_CLASS = ContainerRuntime
 '''
@@ -905,7 +1404,11 @@ import os
 class PythonExecutor:
     def __init__(self, work_dir):
         self.work_dir = work_dir
-    
+        # os.environ.copy() walks and decodes the whole environment; do it
+        # once here instead of per job, and pin the interpreter path
+        self._base_env = os.environ.copy()
+        self._interp = sys.executable
+
     def execute(self, job_id, code=None, script=None, args=None, env=None, timeout=3600):
         jd = os.path.join(self.work_dir, job_id)
         os.makedirs(jd, exist_ok=True)
@@ -920,11 +1423,13 @@ class PythonExecutor:
         if not sp:
             return 1, "", "No code or script"
         
+        # Only build a merged dict when the job actually overrides something
+        merged_env = self._base_env if not env else {**self._base_env, **env}
         try:
             r = subprocess.run(
-                [sys.executable, sp] + (args or []),
+                [self._interp, sp] + (args or []),
                 capture_output=True, text=True, timeout=timeout,
-                cwd=jd, env={**os.environ, **(env or {})}
+                cwd=jd, env=merged_env
             )
             return r.returncode, r.stdout, r.stderr
         except Exception as e:
@@ -1023,6 +1528,23 @@ class QuineSelf:
 QUINE_SELF_CLASS = QuineSelf
 '''
 
+# The built-in capabilities share a huge vocabulary (imports, subprocess
+# incantations, psutil calls). Training a zstd dictionary on that corpus
+# once improves the ratio markedly on small capabilities and lets matches
+# come from the preseeded dict instead of being re-learned per genome.
+# Every node trains from the same embedded templates, so peers agree on
+# the dictionary without shipping it separately.
+if zstd is not None:
+    try:
+        _CAP_DICT = zstd.train_dictionary(16384, [t.encode('utf-8') for t in (
+            CAP_CORE_IDENTITY, CAP_CORE_CONFIG, CAP_CORE_HARDWARE,
+            CAP_NETWORK_MESH, CAP_COMPUTE_CONTAINER, CAP_COMPUTE_PYTHON,
+            CAP_COMPUTE_BLENDER, CAP_QUINE_SELF)])
+        _ZCTX_C = zstd.ZstdCompressor(level=6, dict_data=_CAP_DICT)
+        _ZCTX_D = zstd.ZstdDecompressor(dict_data=_CAP_DICT)
+    except Exception:
+        pass  # some zstd builds refuse tiny corpora; plain contexts remain
+
 # =============================================================================
 # PHASE 9: CAPABILITY FACTORY (Creates built-in capabilities)
 # =============================================================================
@@ -1134,8 +1656,9 @@ class HydraKernel:
     Each head of the Hydra is a capability that can be grown or severed.
     """
     
-    def __init__(self, role: str = "SEED"):
+    def __init__(self, role: str = "SEED", lightweight: bool = False):
         self.role = role
+        self.lightweight = lightweight
         self.start_time = time.time()
         
         # Core systems
@@ -1165,9 +1688,37 @@ class HydraKernel:
         quine_self_class = self.loader.get_symbol('QUINE_SELF_CLASS')
         self.quine = quine_self_class(self.loader)
         
-        # Jobs
+        # Jobs: pending ids flow through a queue (O(1) wakeup, no scan of
+        # the jobs dict) and run in parallel on the executor pool; the
+        # dict is kept for status queries only
         self.jobs = {}
         self.jobs_lock = threading.RLock()
+        self._pending = queue.Queue()
+        self._job_exec = ThreadPoolExecutor(max_workers=os.cpu_count() or 2,
+                                            thread_name_prefix='job')
+        atexit.register(self._job_exec.shutdown, wait=False)
+
+        # Serialized /capabilities and /stream bodies, rebuilt only when
+        # the registry version moves
+        self._caps_cache = (-1, b'', b'')
+
+        # Serialized /health body with a 500ms TTL: monitoring pollers get
+        # a shared snapshot instead of a hardware probe per request
+        self._health_cache = (0.0, b'')
+
+        # Local IP never changes over a kernel's lifetime; resolve once.
+        # Lightweight (worker) kernels skip it — only the banner and the
+        # interactive CLI ever display it
+        self._ip = None if lightweight else self._get_ip()
+
+        # Static identity of our own source for the '/' quine endpoint
+        try:
+            st = os.stat(__file__)
+            self._src_size = st.st_size
+            self._src_etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+        except OSError:
+            self._src_size = 0
+            self._src_etag = '"0"'
         
         # Start DNA server
         threading.Thread(target=self._run_dna_server, daemon=True).start()
@@ -1195,16 +1746,31 @@ class HydraKernel:
                 print(f"[HYDRA] Failed to activate {cap_id}: {e}")
     
     def _get_ip(self) -> str:
-        import psutil
-        for iface, snics in psutil.net_if_addrs().items():
-            for s in snics:
-                if s.family == socket.AF_INET and not s.address.startswith("127."):
-                    if any(x in iface.lower() for x in ['eth', 'en', 'wlan', 'wifi']):
-                        return s.address
+        # Routing-table trick: a connect() on a UDP socket never sends a
+        # packet but does pick the outbound interface, which is both faster
+        # and more accurate than walking every NIC
+        try:
+            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            try:
+                s.connect(('8.8.8.8', 80))
+                return s.getsockname()[0]
+            finally:
+                s.close()
+        except OSError:
+            pass
+        try:
+            import psutil
+            for iface, snics in psutil.net_if_addrs().items():
+                for s in snics:
+                    if s.family == socket.AF_INET and not s.address.startswith("127."):
+                        if any(x in iface.lower() for x in ['eth', 'en', 'wlan', 'wifi']):
+                            return s.address
+        except ImportError:
+            pass
         return "127.0.0.1"
-    
+
     def _print_banner(self):
-        ip = self._get_ip()
+        ip = self._ip
         hw = self.hw_probe.compact()
         active_caps = len(self.loader.list_active())
         total_caps = len(self.registry.all())
@@ -1252,12 +1818,15 @@ class HydraKernel:
             cap_id = packet.get('data', {}).get('id')
             manifest = self.registry.get(cap_id)
             if manifest:
-                self.mesh.broadcast('CAPABILITY_RESPONSE', 
-                    capability=manifest.to_dict())
-        
+                self.mesh.broadcast_batched('CAPABILITY_RESPONSE',
+                    'capabilities', manifest.to_dict())
+
         elif op == 'CAPABILITY_RESPONSE':
-            cap_dict = packet.get('data', {}).get('capability')
-            if cap_dict:
+            data = packet.get('data', {})
+            cap_dicts = list(data.get('capabilities') or [])
+            if data.get('capability'):  # older single-item form
+                cap_dicts.append(data['capability'])
+            for cap_dict in cap_dicts:
                 manifest = CapabilityManifest.from_dict(cap_dict)
                 self.stream.publish(manifest)
         
@@ -1266,10 +1835,35 @@ class HydraKernel:
             if job:
                 self._queue_job(job)
     
+    def _capability_cache(self):
+        """(version, list_bytes, stream_bytes) — cached until registry changes"""
+        version = self.registry.version
+        cache = self._caps_cache
+        if cache[0] != version:
+            caps = []
+            stream_lines = []
+            for m in self.registry.all():
+                d = m.to_dict()
+                stream_lines.append(_dumps(d))
+                d = dict(d)
+                d['genome'] = f"<{m.genome_size} bytes>"  # no genome in list
+                caps.append(d)
+            # the list stays pretty-printed (it is read by humans and only
+            # rebuilt when the registry version moves)
+            cache = (version,
+                     json.dumps(caps, indent=2).encode(),
+                     b'\n'.join(stream_lines) + b'\n' if stream_lines else b'')
+            self._caps_cache = cache
+        return cache
+
     def _queue_job(self, job_data: dict):
-        """Queue a job for execution"""
+        """Queue a job for execution (idempotent on the job id)"""
         job_id = job_data.get('id', uuid.uuid4().hex[:12])
         with self.jobs_lock:
+            # A re-delivered JOB_SUBMIT must not reset a job that is
+            # already queued, running or finished back to pending
+            if job_id in self.jobs:
+                return job_id
             self.jobs[job_id] = {
                 'id': job_id,
                 'type': job_data.get('type', 'python'),
@@ -1277,72 +1871,97 @@ class HydraKernel:
                 'status': 'pending',
                 'created': time.time()
             }
+        self._pending.put(job_id)
         return job_id
     
     def _worker_loop(self):
-        """Background job execution"""
+        """Dispatch pending jobs to the executor pool"""
         while True:
-            job = None
+            jid = self._pending.get()
             with self.jobs_lock:
-                for jid, j in self.jobs.items():
-                    if j['status'] == 'pending':
-                        j['status'] = 'running'
-                        job = j
-                        break
-            
-            if job:
-                jtype = job['type']
-                spec = job['spec']
-                
-                try:
-                    if jtype == 'python':
-                        ec, out, err = self.python_exec.execute(
-                            job['id'], 
-                            code=spec.get('code'),
-                            script=spec.get('script'),
-                            args=spec.get('args')
-                        )
-                    elif jtype == 'container':
-                        ec, out, err = self.container.run(
-                            job['id'],
-                            image=spec.get('image'),
-                            command=spec.get('command'),
-                            gpu=spec.get('gpu', False)
-                        )
-                    else:
-                        ec, out, err = 1, "", f"Unknown job type: {jtype}"
-                    
-                    with self.jobs_lock:
-                        job['status'] = 'completed' if ec == 0 else 'failed'
-                        job['exit_code'] = ec
-                        job['output'] = out
-                        job['error'] = err
-                    
-                    print(f"[WORKER] Job {job['id'][:8]} {'✓' if ec == 0 else '✗'}")
-                    
-                except Exception as e:
-                    with self.jobs_lock:
-                        job['status'] = 'failed'
-                        job['error'] = str(e)
-            
-            time.sleep(1)
+                job = self.jobs.get(jid)
+                if job is None or job['status'] != 'pending':
+                    continue
+                job['status'] = 'running'
+            self._job_exec.submit(self._run_job, job)
+
+    def _run_job(self, job: dict):
+        """Execute one job (runs on the job pool)"""
+        jtype = job['type']
+        spec = job['spec']
+
+        try:
+            if jtype == 'python':
+                ec, out, err = self.python_exec.execute(
+                    job['id'],
+                    code=spec.get('code'),
+                    script=spec.get('script'),
+                    args=spec.get('args')
+                )
+            elif jtype == 'container':
+                ec, out, err = self.container.run(
+                    job['id'],
+                    image=spec.get('image'),
+                    command=spec.get('command'),
+                    gpu=spec.get('gpu', False)
+                )
+            else:
+                ec, out, err = 1, "", f"Unknown job type: {jtype}"
+
+            with self.jobs_lock:
+                job['status'] = 'completed' if ec == 0 else 'failed'
+                job['exit_code'] = ec
+                job['output'] = out
+                job['error'] = err
+
+            print(f"[WORKER] Job {job['id'][:8]} {'✓' if ec == 0 else '✗'}")
+
+        except Exception as e:
+            with self.jobs_lock:
+                job['status'] = 'failed'
+                job['error'] = str(e)
     
     def _run_dna_server(self):
         """HTTP server for streaming capabilities"""
         kernel = self
-        
+        # Bound handler concurrency so a scrape flood cannot spawn
+        # unbounded threads
+        sem = threading.BoundedSemaphore(32)
+
         class Handler(http.server.BaseHTTPRequestHandler):
             def do_GET(self):
+                with sem:
+                    self._handle_get()
+
+            def do_POST(self):
+                with sem:
+                    self._handle_post()
+
+            def _handle_get(self):
                 if self.path == '/':
-                    # Full source (reconstruct from capabilities)
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'text/plain')
-                    self.end_headers()
-                    # Read our own source
+                    # Full source — ETag short-circuit, then zero-copy sendfile
+                    if self.headers.get('If-None-Match') == kernel._src_etag:
+                        self.send_response(304)
+                        self.send_header('ETag', kernel._src_etag)
+                        self.end_headers()
+                        return
                     try:
-                        with open(__file__, 'r') as f:
-                            self.wfile.write(f.read().encode())
-                    except:
+                        with open(__file__, 'rb') as f:
+                            self.send_response(200)
+                            self.send_header('Content-Type', 'text/plain')
+                            self.send_header('Content-Length', str(kernel._src_size))
+                            self.send_header('ETag', kernel._src_etag)
+                            self.end_headers()
+                            self.wfile.flush()
+                            try:
+                                os.sendfile(self.wfile.fileno(), f.fileno(),
+                                            0, kernel._src_size)
+                            except (OSError, AttributeError):
+                                shutil.copyfileobj(f, self.wfile)
+                    except OSError:
+                        self.send_response(200)
+                        self.send_header('Content-Type', 'text/plain')
+                        self.end_headers()
                         self.wfile.write(b"# Source unavailable")
                 
                 elif self.path == '/capabilities':
@@ -1350,21 +1969,14 @@ class HydraKernel:
                     self.send_response(200)
                     self.send_header('Content-Type', 'application/json')
                     self.end_headers()
-                    caps = []
-                    for m in kernel.registry.all():
-                        d = m.to_dict()
-                        d['genome'] = f"<{m.genome_size} bytes>"  # Don't send full genome in list
-                        caps.append(d)
-                    self.wfile.write(json.dumps(caps, indent=2).encode())
-                
+                    self.wfile.write(kernel._capability_cache()[1])
+
                 elif self.path == '/stream':
                     # Stream all capabilities (full genome)
                     self.send_response(200)
                     self.send_header('Content-Type', 'application/x-ndjson')
                     self.end_headers()
-                    for m in kernel.registry.all():
-                        line = json.dumps(m.to_dict()) + '\n'
-                        self.wfile.write(line.encode())
+                    self.wfile.write(kernel._capability_cache()[2])
                 
                 elif self.path.startswith('/capability/'):
                     # Get single capability
@@ -1374,7 +1986,7 @@ class HydraKernel:
                         self.send_response(200)
                         self.send_header('Content-Type', 'application/json')
                         self.end_headers()
-                        self.wfile.write(json.dumps(manifest.to_dict()).encode())
+                        self.wfile.write(_dumps(manifest.to_dict()))
                     else:
                         self.send_response(404)
                         self.end_headers()
@@ -1392,52 +2004,47 @@ class HydraKernel:
                             'registered': len(kernel.registry.all())
                         }
                     }
-                    self.wfile.write(json.dumps(status).encode())
+                    self.wfile.write(_dumps(status))
                 
                 elif self.path == '/health':
                     self.send_response(200)
                     self.send_header('Content-Type', 'application/json')
                     self.end_headers()
-                    hw = kernel.hw_probe.snapshot()
-                    self.wfile.write(json.dumps(asdict(hw)).encode())
+                    now = time.monotonic()
+                    ts, body = kernel._health_cache
+                    if now - ts >= 0.5:
+                        hw = kernel.hw_probe.snapshot()
+                        body = _dumps(asdict(hw))
+                        kernel._health_cache = (now, body)
+                    self.wfile.write(body)
                 
                 else:
                     self.send_response(404)
                     self.end_headers()
             
-            def do_POST(self):
+            def _handle_post(self):
                 if self.path == '/inject':
                     # Inject a new capability
                     cl = int(self.headers.get('Content-Length', 0))
                     body = self.rfile.read(cl).decode()
                     try:
-                        data = json.loads(body)
                         # Create capability from posted data
-                        source = data.get('source', '')
                         manifest = CapabilityCodec.create_manifest(
-                            id=data.get('id', uuid.uuid4().hex[:8]),
-                            name=data.get('name', 'Custom'),
-                            type=CapabilityType(data.get('type', 'plugin')),
-                            source=source,
-                            dependencies=data.get('dependencies', []),
-                            provides=data.get('provides', []),
-                            exports=data.get('exports', []),
-                            description=data.get('description', '')
-                        )
+                            **_parse_inject(body))
                         kernel.registry.register(manifest)
                         kernel.stream.publish(manifest)
                         
-                        # Broadcast to mesh
-                        kernel.mesh.broadcast('CAPABILITY_ANNOUNCE',
-                            capabilities=[manifest.to_dict()])
+                        # Broadcast to mesh (coalesced across burst injects)
+                        kernel.mesh.broadcast_batched('CAPABILITY_ANNOUNCE',
+                            'capabilities', manifest.to_dict())
                         
                         self.send_response(200)
                         self.send_header('Content-Type', 'application/json')
                         self.end_headers()
-                        self.wfile.write(json.dumps({
+                        self.wfile.write(_dumps({
                             'id': manifest.id,
                             'hash': manifest.genome_hash
-                        }).encode())
+                        }))
                     except Exception as e:
                         self.send_response(400)
                         self.end_headers()
@@ -1453,7 +2060,7 @@ class HydraKernel:
                         self.send_response(200)
                         self.send_header('Content-Type', 'application/json')
                         self.end_headers()
-                        self.wfile.write(json.dumps({'job_id': job_id}).encode())
+                        self.wfile.write(_dumps({'job_id': job_id}))
                     except Exception as e:
                         self.send_response(400)
                         self.end_headers()
@@ -1466,9 +2073,14 @@ class HydraKernel:
             def log_message(self, *args):
                 pass
         
-        socketserver.TCPServer.allow_reuse_address = True
+        # Threaded server: /capabilities, /health and /cluster polls no
+        # longer head-of-line block behind a slow /stream pull
+        class _Server(http.server.ThreadingHTTPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
         try:
-            with socketserver.TCPServer(("", self.config.http_port), Handler) as httpd:
+            with _Server(("", self.config.http_port), Handler) as httpd:
                 httpd.serve_forever()
         except Exception as e:
             print(f"[DNA] Server error: {e}")
@@ -1477,7 +2089,8 @@ class HydraKernel:
         return {
             'node_id': self.config.node_id,
             'uptime': time.time() - self.start_time,
-            'peers': self.mesh.get_peers(),
+            'peers': {pid: p.to_dict()
+                      for pid, p in self.mesh.get_peers().items()},
             'capabilities': {
                 'active': [(c.id, c.manifest.name) for c in self.loader.list_active()],
                 'registered': len(self.registry.all())
@@ -1493,8 +2106,8 @@ class HydraKernel:
 # PHASE 11: CLI
 # =============================================================================
 
-def print_help():
-    print("""
+# Static help box built once at import; print_help is a single write
+_HELP_TEXT = """
 ╔══════════════════════════════════════════════════════════════════════════════╗
 ║                     DEEDOOP OS v13.0 — THE HYDRA                             ║
 ╠══════════════════════════════════════════════════════════════════════════════╣
@@ -1512,146 +2125,307 @@ def print_help():
 ║  OTHER                                                                       ║
 ║    help                - This help       exit                - Shutdown      ║
 ╚══════════════════════════════════════════════════════════════════════════════╝
-""")
+
+"""
+
+def print_help():
+    sys.stdout.write(_HELP_TEXT)
+
+# Short-TTL memo for the registry walks behind caps/stream: back-to-back
+# REPL queries inside the window reuse the last enumeration instead of
+# re-walking the registry. Entries carry a version key — the registry's
+# own version counter plus _cli_gen, which activation changes bump — so
+# mutations invalidate immediately rather than waiting out the TTL.
+_CLI_TTL = 2.0
+_cli_gen = 0
+_cli_cache = {}
+
+def _cli_cached(key, version, fn):
+    now = time.monotonic()
+    hit = _cli_cache.get(key)
+    if hit is not None and hit[0] == version and now - hit[1] < _CLI_TTL:
+        return hit[2]
+    result = fn()
+    _cli_cache[key] = (version, now, result)
+    return result
+
+def _cmd_caps(kernel, args):
+    ver = (kernel.registry.version, _cli_gen)
+    active = _cli_cached('active', ver, kernel.loader.list_active)
+    all_caps = _cli_cached('all', ver, kernel.registry.all)
+    # writelines drains the row generator into the buffered stream —
+    # no per-row print and no intermediate joined string for big tables
+    sys.stdout.write("\n Active Capabilities:\n")
+    sys.stdout.writelines(
+        f"   [{cap.manifest.type.value:8}] {cap.id:<24} {cap.manifest.name}\n"
+        for cap in active)
+    sys.stdout.write(f"\n Registered: {len(all_caps)} total\n\n")
+
+def _cmd_cap(kernel, args):
+    if not args:
+        print("Usage: cap <id>")
+        return
+    manifest = kernel.registry.get(args)
+    if manifest:
+        print(f"\n Capability: {manifest.id}")
+        print(f"   Name:    {manifest.name}")
+        print(f"   Type:    {manifest.type.value}")
+        print(f"   Version: {manifest.version}")
+        print(f"   Hash:    {manifest.genome_hash}")
+        print(f"   Size:    {manifest.genome_size} bytes")
+        print(f"   Deps:    {manifest.dependencies}")
+        print(f"   Exports: {manifest.exports}\n")
+    else:
+        print("Not found")
+
+def _cmd_activate(kernel, args):
+    global _cli_gen
+    if not args:
+        print("Usage: activate <id>")
+        return
+    try:
+        kernel.loader.activate(args)
+        _cli_gen += 1
+        print(f"Activated: {args}")
+    except Exception as e:
+        print(f"Error: {e}")
+
+def _cmd_deactivate(kernel, args):
+    global _cli_gen
+    if not args:
+        print("Usage: deactivate <id>")
+        return
+    kernel.loader.deactivate(args)
+    _cli_gen += 1
+    print(f"Deactivated: {args}")
+
+def _cmd_stream(kernel, args):
+    ver = (kernel.registry.version, _cli_gen)
+    # Hoist the active-id set: O(1) membership test per row
+    # instead of rebuilding the active list per iteration
+    active_ids = {c.id for c in
+                  _cli_cached('active', ver, kernel.loader.list_active)}
+    sys.stdout.write("\n Capability Stream:\n")
+    sys.stdout.writelines(
+        f"   {m.id:<24} {m.genome_hash[:8]} {m.genome_size:>6}B "
+        f"[{'ACTIVE' if m.id in active_ids else 'ready'}]\n"
+        for m in _cli_cached('all', ver, kernel.registry.all))
+    sys.stdout.write("\n")
+
+def _parse_inject(raw):
+    """Decode an inject payload and materialize manifest kwargs in one pass.
+
+    Shared by the CLI inject command and the HTTP /inject handler so both
+    validate identically; raises on malformed JSON, a non-object payload
+    or an unknown capability type.
+    """
+    data = _loads(raw)
+    if not isinstance(data, dict):
+        raise ValueError("inject payload must be a JSON object")
+    type_str = data.get('type', 'plugin')
+    cap_type = _TYPE_MAP.get(type_str)
+    if cap_type is None:
+        raise ValueError(f"unknown capability type: {type_str!r}")
+    return {
+        'id': data.get('id') or uuid.uuid4().hex[:8],
+        'name': data.get('name', 'Custom'),
+        'type': cap_type,
+        'source': data.get('source', ''),
+        'dependencies': data.get('dependencies', []),
+        'provides': data.get('provides', []),
+        'exports': data.get('exports', []),
+        'description': data.get('description', ''),
+    }
+
+def _cmd_inject(kernel, args):
+    if not args:
+        print("Usage: inject <json>")
+        print('Example: inject {"id":"test","name":"Test","type":"plugin","source":"print(42)"}')
+        return
+    try:
+        manifest = CapabilityCodec.create_manifest(**_parse_inject(args))
+        kernel.registry.register(manifest)
+        kernel.stream.publish(manifest)
+        print(f"Injected: {manifest.id} (hash: {manifest.genome_hash})")
+    except Exception as e:
+        print(f"Error: {e}")
+
+def _cmd_evolve(kernel, args):
+    cap_id, new_source = _split_cmd(args)
+    if not new_source:
+        print("Usage: evolve <capability_id> <new_source>")
+        return
+    result = kernel.quine.evolve(cap_id, new_source)
+    if result:
+        print(f"Evolved {cap_id} → new hash: {result}")
+    else:
+        print(f"Capability not found: {cap_id}")
+
+def _cmd_nodes(kernel, args):
+    peers = kernel.mesh.get_peers()
+    sys.stdout.write(f"\n Cluster: {len(peers) + 1} nodes\n"
+                     f"   {kernel.config.node_id} (self)\n")
+    sys.stdout.writelines(f"   {pid} [{info.ip}]\n"
+                          for pid, info in peers.items())
+    sys.stdout.write("\n")
+
+# Hardware snapshot for the health command, held for 5s: hammering
+# health while debugging reuses the probe instead of re-running it
+_hw_cache = {'ts': 0.0, 'snap': None}
+
+def _cached_snapshot(kernel):
+    now = time.monotonic()
+    if _hw_cache['snap'] is None or now - _hw_cache['ts'] > 5.0:
+        _hw_cache['snap'] = kernel.hw_probe.snapshot()
+        _hw_cache['ts'] = now
+    return _hw_cache['snap']
+
+def _cmd_health(kernel, args):
+    hw = _cached_snapshot(kernel)
+    sys.stdout.write(
+        f"\n Hardware: {hw.cpu_total}C | {hw.ram_total}G | GPU×{hw.gpu_total}\n"
+        f" Docker: {'✓' if hw.has_docker else '✗'} | "
+        f"NVIDIA: {'✓' if hw.has_nvidia else '✗'}\n\n")
+
+def _cmd_status(kernel, args):
+    st = kernel.get_cluster_status()
+    sys.stdout.write(
+        f"\n Cluster Status\n"
+        f"   Uptime: {st['uptime']:.0f}s\n"
+        f"   Peers:  {len(st['peers'])}\n"
+        f"   Caps:   {st['capabilities']['registered']} registered, "
+        f"{len(st['capabilities']['active'])} active\n"
+        f"   Jobs:   {st['jobs']['pending']} pending, "
+        f"{st['jobs']['running']} running\n\n")
+
+def _cmd_jobs(kernel, args):
+    # Snapshot under the lock, format and write outside it: stdout can be
+    # a slow terminal and must not stall the scheduler's job mutations
+    with kernel.jobs_lock:
+        snapshot = list(kernel.jobs.values())
+    if not snapshot:
+        print("No jobs")
+        return
+    sys.stdout.write(f"\n {'ID':<12} {'TYPE':<10} {'STATUS':<10}\n")
+    sys.stdout.writelines(
+        f" {j['id'][:10]:<12} {j['type']:<10} {j['status']:<10}\n"
+        for j in snapshot)
+    sys.stdout.write("\n")
+
+def _cmd_run(kernel, args):
+    jtype, spec = _split_cmd(args)
+    if not spec:
+        print("Usage: run <type> <spec>")
+        return
+    job_data = {
+        'id': uuid.uuid4().hex[:12],
+        'type': jtype,
+        'spec': {'code': spec} if jtype == 'python' else {'image': spec}
+    }
+    job_id = kernel._queue_job(job_data)
+    print(f"Submitted: {job_id}")
+
+def _cmd_help(kernel, args):
+    print_help()
+
+def _cmd_exit(kernel, args):
+    print("Shutting down Hydra...")
+    sys.exit(0)
+
+# Constant-time action resolve: one dict lookup per command instead of a
+# chain of ~15 string compares. Handlers are module-level so each gets a
+# small frame of its own rather than sharing the old giant cli body.
+# Keys are interned and _dispatch interns the incoming action, so the
+# dict probe short-circuits on pointer identity before ever comparing
+# characters — microscopic per command, real for scripted floods.
+HANDLERS = {sys.intern(k): v for k, v in {
+    'caps': _cmd_caps,
+    'cap': _cmd_cap,
+    'activate': _cmd_activate,
+    'deactivate': _cmd_deactivate,
+    'stream': _cmd_stream,
+    'inject': _cmd_inject,
+    'evolve': _cmd_evolve,
+    'nodes': _cmd_nodes,
+    'health': _cmd_health,
+    'status': _cmd_status,
+    'jobs': _cmd_jobs,
+    'run': _cmd_run,
+    'help': _cmd_help,
+    'exit': _cmd_exit,
+    'quit': _cmd_exit,
+}.items()}
+
+# One C-level regex scan splits action from args — no intermediate list
+# and no second Python-level split for the two-token commands
+_TOKEN_RE = re.compile(r'\S+')
+
+def _split_cmd(line):
+    m = _TOKEN_RE.match(line)
+    if m is None:
+        return '', ''
+    return m.group(), line[m.end():].lstrip()
+
+def _dispatch(kernel, cmd):
+    action, args = _split_cmd(cmd)
+    action = sys.intern(action.lower())
+
+    handler = HANDLERS.get(action)
+    if handler is not None:
+        handler(kernel, args)
+    else:
+        print(f"Unknown: {action}. Type 'help'")
+
+def _setup_readline(kernel):
+    """Tab completion and persistent history for the interactive prompt"""
+    try:
+        import readline
+    except ImportError:
+        return  # e.g. Windows without pyreadline
+
+    histfile = os.path.join(kernel.config.data_dir, 'cli_history')
+    try:
+        readline.read_history_file(histfile)
+    except OSError:
+        pass
+    readline.set_history_length(1000)
+
+    def _save_history():
+        try:
+            readline.write_history_file(histfile)
+        except OSError:
+            pass
+    atexit.register(_save_history)
+
+    def _complete(text, state):
+        # Commands plus live capability ids; the registry lookup rides
+        # the CLI's versioned memo so completion stays cheap
+        ver = (kernel.registry.version, _cli_gen)
+        options = [k for k in HANDLERS if k.startswith(text)]
+        options += [m.id for m in _cli_cached('all', ver, kernel.registry.all)
+                    if m.id.startswith(text)]
+        return options[state] if state < len(options) else None
+    readline.set_completer(_complete)
+    readline.parse_and_bind('tab: complete')
 
 def cli(kernel: HydraKernel):
+    if not sys.stdin.isatty():
+        # Scripted/piped session: iterate the buffered stream directly —
+        # stdin arrives in big chunks and the line splitting happens in C,
+        # with none of input()'s per-line prompt and readline machinery
+        for line in sys.stdin:
+            cmd = line.strip()
+            if cmd:
+                _dispatch(kernel, cmd)
+        return
+
+    _setup_readline(kernel)
     while True:
         try:
             cmd = input("hydra> ").strip()
             if not cmd:
                 continue
-            
-            parts = cmd.split(maxsplit=1)
-            action = parts[0].lower()
-            args = parts[1] if len(parts) > 1 else ""
-            
-            if action == 'caps':
-                print("\n Active Capabilities:")
-                for cap in kernel.loader.list_active():
-                    print(f"   [{cap.manifest.type.value:8}] {cap.id:<24} {cap.manifest.name}")
-                print(f"\n Registered: {len(kernel.registry.all())} total\n")
-            
-            elif action == 'cap' and args:
-                manifest = kernel.registry.get(args)
-                if manifest:
-                    print(f"\n Capability: {manifest.id}")
-                    print(f"   Name:    {manifest.name}")
-                    print(f"   Type:    {manifest.type.value}")
-                    print(f"   Version: {manifest.version}")
-                    print(f"   Hash:    {manifest.genome_hash}")
-                    print(f"   Size:    {manifest.genome_size} bytes")
-                    print(f"   Deps:    {manifest.dependencies}")
-                    print(f"   Exports: {manifest.exports}\n")
-                else:
-                    print("Not found")
-            
-            elif action == 'activate' and args:
-                try:
-                    kernel.loader.activate(args)
-                    print(f"Activated: {args}")
-                except Exception as e:
-                    print(f"Error: {e}")
-            
-            elif action == 'deactivate' and args:
-                kernel.loader.deactivate(args)
-                print(f"Deactivated: {args}")
-            
-            elif action == 'stream':
-                print("\n Capability Stream:")
-                for m in kernel.registry.all():
-                    status = "ACTIVE" if m.id in [c.id for c in kernel.loader.list_active()] else "ready"
-                    print(f"   {m.id:<24} {m.genome_hash[:8]} {m.genome_size:>6}B [{status}]")
-                print()
-            
-            elif action == 'inject':
-                if not args:
-                    print("Usage: inject <json>")
-                    print('Example: inject {"id":"test","name":"Test","type":"plugin","source":"print(42)"}')
-                else:
-                    try:
-                        data = json.loads(args)
-                        source = data.get('source', '')
-                        manifest = CapabilityCodec.create_manifest(
-                            id=data.get('id', uuid.uuid4().hex[:8]),
-                            name=data.get('name', 'Custom'),
-                            type=CapabilityType(data.get('type', 'plugin')),
-                            source=source,
-                            dependencies=data.get('dependencies', []),
-                            exports=data.get('exports', [])
-                        )
-                        kernel.registry.register(manifest)
-                        kernel.stream.publish(manifest)
-                        print(f"Injected: {manifest.id} (hash: {manifest.genome_hash})")
-                    except Exception as e:
-                        print(f"Error: {e}")
-            
-            elif action == 'evolve':
-                parts = args.split(maxsplit=1)
-                if len(parts) < 2:
-                    print("Usage: evolve <capability_id> <new_source>")
-                else:
-                    cap_id, new_source = parts
-                    result = kernel.quine.evolve(cap_id, new_source)
-                    if result:
-                        print(f"Evolved {cap_id} → new hash: {result}")
-                    else:
-                        print(f"Capability not found: {cap_id}")
-            
-            elif action == 'nodes':
-                peers = kernel.mesh.get_peers()
-                print(f"\n Cluster: {len(peers) + 1} nodes")
-                print(f"   {kernel.config.node_id} (self)")
-                for pid, info in peers.items():
-                    print(f"   {pid} [{info['ip']}]")
-                print()
-            
-            elif action == 'health':
-                hw = kernel.hw_probe.snapshot()
-                print(f"\n Hardware: {hw.cpu_total}C | {hw.ram_total}G | GPU×{hw.gpu_total}")
-                print(f" Docker: {'✓' if hw.has_docker else '✗'} | NVIDIA: {'✓' if hw.has_nvidia else '✗'}\n")
-            
-            elif action == 'status':
-                st = kernel.get_cluster_status()
-                print(f"\n Cluster Status")
-                print(f"   Uptime: {st['uptime']:.0f}s")
-                print(f"   Peers:  {len(st['peers'])}")
-                print(f"   Caps:   {st['capabilities']['registered']} registered, {len(st['capabilities']['active'])} active")
-                print(f"   Jobs:   {st['jobs']['pending']} pending, {st['jobs']['running']} running\n")
-            
-            elif action == 'jobs':
-                with kernel.jobs_lock:
-                    if not kernel.jobs:
-                        print("No jobs")
-                    else:
-                        print(f"\n {'ID':<12} {'TYPE':<10} {'STATUS':<10}")
-                        for j in kernel.jobs.values():
-                            print(f" {j['id'][:10]:<12} {j['type']:<10} {j['status']:<10}")
-                        print()
-            
-            elif action == 'run':
-                parts = args.split(maxsplit=1)
-                if len(parts) < 2:
-                    print("Usage: run <type> <spec>")
-                else:
-                    jtype, spec = parts
-                    job_data = {
-                        'id': uuid.uuid4().hex[:12],
-                        'type': jtype,
-                        'spec': {'code': spec} if jtype == 'python' else {'image': spec}
-                    }
-                    job_id = kernel._queue_job(job_data)
-                    print(f"Submitted: {job_id}")
-            
-            elif action == 'help':
-                print_help()
-            
-            elif action in ('exit', 'quit'):
-                print("Shutting down Hydra...")
-                sys.exit(0)
-            
-            else:
-                print(f"Unknown: {action}. Type 'help'")
-        
+            _dispatch(kernel, cmd)
         except KeyboardInterrupt:
             print("\nUse 'exit' to quit")
         except EOFError:
@@ -1662,13 +2436,25 @@ def cli(kernel: HydraKernel):
 # =============================================================================
 
 def main():
-    role = 'WORKER' if not sys.stdin.isatty() else 'SEED'
-    kernel = HydraKernel(role)
-    
+    # Decide the role once up front; workers come up lightweight and skip
+    # the CLI-only pieces of kernel init. --cli forces SEED mode on piped
+    # stdin so scripted sessions (inject/evolve batches) reach the
+    # buffered non-tty CLI path instead of parking as a worker.
+    if '--cli' in sys.argv:
+        role = 'SEED'
+    else:
+        role = 'WORKER' if not sys.stdin.isatty() else 'SEED'
+    kernel = HydraKernel(role, lightweight=(role == 'WORKER'))
+
     if role == 'WORKER':
         print(f"[HYDRA] Node {kernel.config.node_id} joined mesh")
-        while True:
-            time.sleep(60)
+        # Park the main thread until a signal arrives: zero wakeups
+        # instead of a pointless sleep(60) spin, and shutdown happens
+        # immediately on SIGTERM/SIGINT rather than within a minute
+        shutdown_evt = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: shutdown_evt.set())
+        signal.signal(signal.SIGINT, lambda *_: shutdown_evt.set())
+        shutdown_evt.wait()
     else:
         cli(kernel)
 